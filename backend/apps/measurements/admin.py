@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Measurement
+from .models import Measurement, IngestionJob
 
 
 @admin.register(Measurement)
@@ -31,4 +31,18 @@ class MeasurementAdmin(admin.ModelAdmin):
         }),
     )
     
-    ordering = ['-timestamp'] 
\ No newline at end of file
+    ordering = ['-timestamp']
+    # skip the unfiltered COUNT(*) over the whole table on every changelist page
+    show_full_result_count = False
+
+
+@admin.register(IngestionJob)
+class IngestionJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'status', 'attempts', 'received_count', 'created_count', 'error_count', 'created_at', 'finished_at'
+    ]
+    list_filter = ['status', 'created_at']
+    exclude = ['payload']
+    readonly_fields = ['created_at', 'updated_at', 'started_at', 'finished_at']
+    ordering = ['-id']
+
@@ -0,0 +1,93 @@
+"""
+Parquet and Arrow IPC encoding of measurement exports.
+
+Every column gets its Arrow type and nullability from the model, and every chunk of rows read from the
+database becomes one record batch (one row group in Parquet), written to an in-memory sink that is drained
+after each batch so the encoded file can be streamed while it is produced.
+"""
+import io
+from typing import Iterable, Iterator, List
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PARQUET_COMPRESSION = 'zstd'
+
+COLUMN_TYPES = {
+    'id': pa.int64(),
+    'timestamp': pa.timestamp('us', tz='UTC'),
+    'latitude': pa.float64(),
+    'longitude': pa.float64(),
+    'technology': pa.string(),
+    'plmn_id': pa.string(),
+    'lac': pa.int32(),
+    'rac': pa.int32(),
+    'tac': pa.int32(),
+    'cell_id': pa.int32(),
+    'frequency_band': pa.string(),
+    'arfcn': pa.int32(),
+    'rsrp': pa.float64(),
+    'rsrq': pa.float64(),
+    'rscp': pa.float64(),
+    'ec_no': pa.float64(),
+    'rxlev': pa.float64(),
+    'download_rate': pa.float64(),
+    'upload_rate': pa.float64(),
+    'ping_response_time': pa.float64(),
+    'dns_response_time': pa.float64(),
+    'web_response_time': pa.float64(),
+    'sms_delivery_time': pa.float64(),
+    'created_at': pa.timestamp('us', tz='UTC'),
+    'updated_at': pa.timestamp('us', tz='UTC'),
+}
+NOT_NULL_COLUMNS = ('id', 'timestamp', 'latitude', 'longitude', 'created_at', 'updated_at')
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that keeps what was written until it is drained"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def build_schema(fields: List[str]) -> pa.Schema:
+    return pa.schema([pa.field(name, COLUMN_TYPES[name], nullable=name not in NOT_NULL_COLUMNS) for name in fields])
+
+
+def encode(fields: List[str], chunks: Iterable[List[tuple]], output: str) -> Iterator[bytes]:
+    """
+    Encode row chunks (tuples starting with the values of fields) as a Parquet file or an Arrow IPC
+    stream, yielding the encoded bytes after every chunk.
+    """
+    schema = build_schema(fields)
+    sink = _ChunkSink()
+    if output == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION)
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    with writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(columns[index], type=field.type) for index, field in enumerate(schema)], schema=schema
+            )
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,194 @@
+"""
+Per-cell summaries of the ``measurements`` table.
+
+Every cell, identified by (plmn_id, lac, tac, cell_id), has one ``cell_summaries`` row with its sample count,
+first and last seen timestamps, the count, sum, min, max and a fixed-width histogram of its signal and throughput
+metrics, and how often each frequency band and ARFCN was observed. Like the rollups (see rollups.py) new
+measurements are merged into the summaries in the transaction that inserts them, and rebuild() recomputes
+the summaries of whole cells from the stored measurements. Migration 0009 backfills them with summarize_stored().
+"""
+import logging
+import math
+from typing import Dict, Iterable, List, Optional
+from django.db.models import Q
+from .models import CellSummary, Measurement
+from .rollups import ROLLUP_BATCH_SIZE, save_merged
+
+logger = logging.getLogger(__name__)
+
+REBUILD_CHUNK_SIZE = 5000
+
+IDENTITY_FIELDS = ('plmn_id', 'lac', 'tac', 'cell_id')
+# width of the histogram bins of every summarized metric
+HISTOGRAM_BIN_WIDTHS = {
+    'rsrp': 5,  # dBm
+    'rsrq': 2,  # dB
+    'rscp': 5,  # dBm
+    'ec_no': 2,  # dB
+    'rxlev': 5,  # dBm
+    'download_rate': 5,  # Mbps
+    'upload_rate': 2,  # Mbps
+}
+VALUE_FIELDS = ('technology', 'count', 'first_seen', 'last_seen', 'metrics', 'frequency_bands', 'arfcns')
+
+
+def summarize(measurements: Iterable[Measurement]) -> Dict[str, CellSummary]:
+    """Unsaved summaries of the given measurements by cell_key"""
+    summaries = {}
+    for measurement in measurements:
+        identity = [getattr(measurement, field) for field in IDENTITY_FIELDS]
+        key = CellSummary.build_cell_key(*identity)
+        summary = summaries.get(key)
+        if summary is None:
+            summary = summaries[key] = CellSummary(
+                cell_key=key, **dict(zip(IDENTITY_FIELDS, identity)),
+                first_seen=measurement.timestamp, last_seen=measurement.timestamp,
+                metrics={}, frequency_bands={}, arfcns={},
+            )
+        _merge(summary, CellSummary(
+            technology=measurement.technology,
+            count=1,
+            first_seen=measurement.timestamp,
+            last_seen=measurement.timestamp,
+            metrics={
+                metric: _single_value_stats(metric, getattr(measurement, metric))
+                for metric in HISTOGRAM_BIN_WIDTHS if getattr(measurement, metric) is not None
+            },
+            frequency_bands={} if measurement.frequency_band is None else {measurement.frequency_band: 1},
+            arfcns={} if measurement.arfcn is None else {str(measurement.arfcn): 1},
+        ))
+    return summaries
+
+
+def add_measurements(measurements: List[Measurement]):
+    """Merge newly inserted measurements into their cells' summaries; call it in the transaction that inserted them"""
+    save_merged(CellSummary, summarize(measurements), _merge, VALUE_FIELDS, 'cell_key')
+
+
+def remove_measurement(measurement: Measurement):
+    """
+    Take a deleted measurement out of its cell's summary; call it in the transaction that deleted it. Counts and
+    sums are decremented in place; only when the measurement held one of the summary's minimums, maximums or its
+    first or last seen timestamp, which can't be taken back out, is that one cell recounted.
+    """
+    identity = [getattr(measurement, field) for field in IDENTITY_FIELDS]
+    summary = CellSummary.objects.select_for_update().filter(cell_key=CellSummary.build_cell_key(*identity)).first()
+    if summary is None:
+        return
+    if summary.count <= 1:
+        summary.delete()
+        return
+
+    values = {metric: getattr(measurement, metric) for metric in HISTOGRAM_BIN_WIDTHS
+              if getattr(measurement, metric) is not None}
+    if measurement.timestamp in (summary.first_seen, summary.last_seen) or any(
+            value in (summary.metrics[metric]['min'], summary.metrics[metric]['max'])
+            for metric, value in values.items() if metric in summary.metrics):
+        rebuild_cell(*identity)
+        return
+
+    summary.count -= 1
+    for metric, value in values.items():
+        stats = summary.metrics[metric]
+        stats['count'] -= 1
+        stats['sum'] -= value
+        _subtract_count(stats['histogram'], _histogram_bin(metric, value))
+    if measurement.frequency_band is not None:
+        _subtract_count(summary.frequency_bands, measurement.frequency_band)
+    if measurement.arfcn is not None:
+        _subtract_count(summary.arfcns, str(measurement.arfcn))
+    summary.save(update_fields=VALUE_FIELDS)
+
+
+def rebuild_cell(plmn_id: Optional[str], lac: Optional[int], tac: Optional[int], cell_id: Optional[int]) -> int:
+    """Recompute the summary of one cell identity from its stored measurements, found through the cell_id index"""
+    identity = Q()
+    for field, value in zip(IDENTITY_FIELDS, (plmn_id, lac, tac, cell_id)):
+        identity &= Q(**{f"{field}__isnull": True}) if value is None else Q(**{field: value})
+    return _rebuild(Measurement.objects.filter(identity), CellSummary.objects.filter(identity))
+
+
+def rebuild(cell_ids: Optional[Iterable[Optional[int]]] = None) -> int:
+    """
+    Recompute the summaries of the given cell_ids (every cell when None) from their stored measurements, reading
+    them in id order chunks through the cell_id index. Returns the number of summaries written.
+    """
+    measurements = Measurement.objects.all()
+    summaries = CellSummary.objects.all()
+    if cell_ids is not None:
+        cell_ids = set(cell_ids)
+        cells = Q(cell_id__in=[cell_id for cell_id in cell_ids if cell_id is not None])
+        if None in cell_ids:
+            cells |= Q(cell_id__isnull=True)
+        measurements = measurements.filter(cells)
+        summaries = summaries.filter(cells)
+    return _rebuild(measurements, summaries)
+
+
+def summarize_stored(measurements) -> Dict[str, CellSummary]:
+    """
+    Unsaved summaries of the measurements of a queryset, read in id order chunks; it may be a queryset of the
+    historical model, for migrations
+    """
+    summaries = {}
+    measurements = measurements.only('timestamp', 'technology', 'frequency_band', 'arfcn',
+                                     *IDENTITY_FIELDS, *HISTOGRAM_BIN_WIDTHS).order_by('id')
+    chunk = list(measurements[:REBUILD_CHUNK_SIZE])
+    while chunk:
+        for key, summary in summarize(chunk).items():
+            if key in summaries:
+                _merge(summaries[key], summary)
+            else:
+                summaries[key] = summary
+        chunk = list(measurements.filter(id__gt=chunk[-1].id)[:REBUILD_CHUNK_SIZE])
+    return summaries
+
+
+def _rebuild(measurements, summaries) -> int:
+    summaries.delete()
+    rebuilt = summarize_stored(measurements)
+    CellSummary.objects.bulk_create(rebuilt.values(), batch_size=ROLLUP_BATCH_SIZE)
+    logger.debug(f"Rebuilt {len(rebuilt)} cell summaries")
+    return len(rebuilt)
+
+
+def _single_value_stats(metric: str, value: float) -> dict:
+    return {'count': 1, 'sum': value, 'min': value, 'max': value, 'histogram': {_histogram_bin(metric, value): 1}}
+
+
+def _histogram_bin(metric: str, value: float) -> str:
+    width = HISTOGRAM_BIN_WIDTHS[metric]
+    return str(math.floor(value / width) * width)
+
+
+def _merge(target: CellSummary, source: CellSummary):
+    if target.count == 0 or source.last_seen >= target.last_seen:
+        target.technology = source.technology
+    target.count += source.count
+    target.first_seen = min(target.first_seen, source.first_seen)
+    target.last_seen = max(target.last_seen, source.last_seen)
+
+    for metric, stats in source.metrics.items():
+        current = target.metrics.get(metric)
+        if current is None:
+            target.metrics[metric] = {**stats, 'histogram': dict(stats['histogram'])}
+            continue
+        current['count'] += stats['count']
+        current['sum'] += stats['sum']
+        current['min'] = min(current['min'], stats['min'])
+        current['max'] = max(current['max'], stats['max'])
+        _add_counts(current['histogram'], stats['histogram'])
+    _add_counts(target.frequency_bands, source.frequency_bands)
+    _add_counts(target.arfcns, source.arfcns)
+
+
+def _subtract_count(counts: Dict[str, int], value: str):
+    if counts.get(value, 0) > 1:
+        counts[value] -= 1
+    else:
+        counts.pop(value, None)
+
+
+def _add_counts(target: Dict[str, int], source: Dict[str, int]):
+    for value, count in source.items():
+        target[value] = target.get(value, 0) + count
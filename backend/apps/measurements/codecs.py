@@ -0,0 +1,169 @@
+"""
+Wire formats of the measurements API.
+
+JSON responses on the read path are encoded with orjson by ``encode_json``, producing exactly the bytes
+DRF's JSONRenderer would. Exports are written as CSV or NDJSON chunks by ``encode_csv`` / ``encode_ndjson``.
+
+Bulk uploads can use a columnar MessagePack format.
+
+A body is a MessagePack map::
+
+    {
+        "batch_id": "optional-client-batch-id",
+        "count": 3,
+        "columns": {"timestamp": [1705314600000, ...], "rsrp": [-85.5, -87.2], ...},
+        "nulls": {"rsrp": b"\\x02"},
+    }
+
+Field names are sent once per upload. ``timestamp`` holds epoch milliseconds (UTC). A column lists only its
+non-null values; its null bitmap has bit ``i`` (LSB first within each byte) set when row ``i`` is null.
+A column without a bitmap has no nulls, and a column missing from ``columns`` is null for every row.
+"""
+import csv
+import io
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+import msgpack
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from . import interfaces, validators
+
+COLUMNAR_MEDIA_TYPE = 'application/vnd.polaris.measurements+msgpack'
+
+FLOAT_COLUMNS = (
+    'latitude', 'longitude', 'rsrp', 'rsrq', 'rscp', 'ec_no', 'rxlev', 'download_rate', 'upload_rate',
+    'ping_response_time', 'dns_response_time', 'web_response_time', 'sms_delivery_time',
+)
+INT_COLUMNS = ('timestamp', 'lac', 'rac', 'tac', 'cell_id', 'arfcn')
+STR_COLUMNS = ('technology', 'plmn_id', 'frequency_band')
+DATETIME_FIELDS = ('timestamp', 'created_at', 'updated_at')
+
+COLUMN_ADAPTERS = {
+    **{name: TypeAdapter(List[float]) for name in FLOAT_COLUMNS},
+    **{name: TypeAdapter(List[int]) for name in INT_COLUMNS},
+    **{name: TypeAdapter(List[str]) for name in STR_COLUMNS},
+}
+
+
+def decode_columnar(body: bytes) -> interfaces.ColumnarMeasurementBatch:
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except (msgpack.UnpackException, ValueError) as e:
+        raise interfaces.InvalidIngestionPayload(f"invalid MessagePack body: {e!r}")
+    if not isinstance(payload, dict):
+        raise interfaces.InvalidIngestionPayload("expected a MessagePack map")
+    try:
+        return interfaces.ColumnarMeasurementBatch(**payload)
+    except ValidationError as e:
+        raise interfaces.InvalidIngestionPayload(str(e))
+
+
+def decode_columnar_rows(batch: interfaces.ColumnarMeasurementBatch) -> validators.BatchValidationResult:
+    """
+    Validate every column with one list-level type check and a column-wise range and length check, and
+    return plain row dicts ready for the bulk insert path without building a model per row.
+    """
+    unknown = set(batch.columns) - set(COLUMN_ADAPTERS)
+    if unknown:
+        raise interfaces.InvalidIngestionPayload(f"unknown columns: {', '.join(sorted(unknown))}")
+    if 'timestamp' not in batch.columns or batch.nulls.get('timestamp'):
+        raise interfaces.InvalidIngestionPayload("timestamp column is required and cannot contain nulls")
+
+    columns = {name: _expand_column(name, values, batch.nulls.get(name), batch.count)
+               for name, values in batch.columns.items()}
+    columns['timestamp'] = [datetime.fromtimestamp(ms / 1000, tz=timezone.utc) for ms in columns['timestamp']]
+    errors = validators.check_column_ranges(columns)
+
+    names = list(columns)
+    rows = [dict(zip(names, values)) for index, values in enumerate(zip(*(columns[name] for name in names)))
+            if index not in errors]
+    return validators.BatchValidationResult(rows, [index in errors for index in range(batch.count)], errors)
+
+
+def encode_columnar(rows: List[Dict], batch_id: Optional[str] = None) -> bytes:
+    """Encode row dicts (timestamps as datetimes) into the columnar wire format."""
+    columns = {}
+    nulls = {}
+    for name in COLUMN_ADAPTERS:
+        values = [row.get(name) for row in rows]
+        if all(value is None for value in values):
+            continue
+        if name == 'timestamp':
+            values = [int(value.timestamp() * 1000) for value in values]
+        bitmap = bytearray((len(rows) + 7) // 8)
+        for index, value in enumerate(values):
+            if value is None:
+                bitmap[index // 8] |= 1 << (index % 8)
+        columns[name] = [value for value in values if value is not None]
+        if any(bitmap):
+            nulls[name] = bytes(bitmap)
+    return msgpack.packb({'batch_id': batch_id, 'count': len(rows), 'columns': columns, 'nulls': nulls})
+
+
+def _expand_column(name: str, values: list, bitmap: Optional[bytes], count: int) -> list:
+    try:
+        values = COLUMN_ADAPTERS[name].validate_python(values)
+    except ValidationError as e:
+        raise interfaces.InvalidIngestionPayload(f"invalid values in column {name}: {e.errors()[0]['msg']}")
+
+    if not bitmap:
+        if len(values) != count:
+            raise interfaces.InvalidIngestionPayload(f"column {name} has {len(values)} values, expected {count}")
+        return values
+
+    if len(bitmap) != (count + 7) // 8:
+        raise interfaces.InvalidIngestionPayload(f"null bitmap of column {name} has the wrong length")
+    null_count = sum(bin(byte).count('1') for byte in bitmap)
+    if len(values) != count - null_count:
+        raise interfaces.InvalidIngestionPayload(
+            f"column {name} has {len(values)} values, expected {count - null_count}"
+        )
+
+    present = iter(values)
+    return [None if bitmap[index // 8] >> (index % 8) & 1 else next(present) for index in range(count)]
+
+
+# orjson formats floats below 1e-4 or from 1e16 on differently from Python's float repr (0.00005 vs 5e-05,
+# 1e16 vs 1e+16). Numbers only follow the colon of a key here, and a quote inside a string value is always
+# escaped, so this cannot match inside strings.
+_NON_REPR_FLOAT = re.compile(rb'(?<=[a-z_]":)-?(?:0\.0000\d*|\d+(?:\.\d+)?e-?\d+)')
+
+
+def encode_json(payload, floats: Optional[Iterable[Optional[float]]] = None) -> bytes:
+    """
+    Encode a response payload of plain dicts, lists, numbers, strings and datetimes with orjson into the
+    same bytes DRF's JSONRenderer produces with its default settings (compact, UTF-8, UTC as 'Z').
+
+    Passing every float of the payload in ``floats`` lets large bodies skip the regex pass over the
+    output unless one of them is formatted differently.
+    """
+    content = orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+    if floats is None or any(value and not 1e-4 <= abs(value) < 1e16 for value in floats):
+        content = _NON_REPR_FLOAT.sub(lambda match: repr(float(match[0])).encode(), content)
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+def encode_ndjson(fields: List[str], rows: List[tuple]) -> bytes:
+    """One JSON object per row and line; rows may carry extra trailing values, which are dropped."""
+    option = orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    return b''.join([orjson.dumps(dict(zip(fields, row)), option=option) for row in rows])
+
+
+def encode_csv_header(fields: List[str]) -> bytes:
+    return (','.join(fields) + '\r\n').encode()
+
+
+def encode_csv(fields: List[str], rows: List[tuple]) -> bytes:
+    """CSV lines without a header; nulls are empty and datetimes ISO 8601 with UTC as 'Z'."""
+    datetime_indexes = [index for index, field in enumerate(fields) if field in DATETIME_FIELDS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        row = list(row[:len(fields)])
+        for index in datetime_indexes:
+            row[index] = row[index].isoformat().replace('+00:00', 'Z')
+        writer.writerow(row)
+    return buffer.getvalue().encode()
@@ -0,0 +1,86 @@
+"""
+Compiler for the declarative measurement filters of interfaces.MeasurementLookups.
+
+Every declared field is named after the Django lookup it compiles to (``rsrp__lte``, ``technology__in``), so a
+set field is applied as is. The metric columns aren't indexed, so a request filtering on them (or on
+``frequency_band``) must also carry a condition on the leading column of one of the ``measurements`` indexes,
+which bounds the rows read; otherwise the request is rejected before it reaches the database. The only orders
+accepted are the ones every index ends in, timestamp first or last. Exports read in (timestamp, id) chunks, so
+filters that read several index ranges (IN-lists of several values, locations) need a date range or an equality
+filter on an indexed column there.
+
+Lookups on the rollup dimensions (``technology__in``, ``plmn_id__in``) can also be answered by the rollups; the
+others need the measurements themselves, so an aggregation using them reads the ``measurements`` table.
+"""
+import logging
+from typing import Any, Dict
+from . import interfaces
+from .rollups import DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+MAX_IN_VALUES = 100
+
+LOOKUPS = tuple(name for name in interfaces.MeasurementLookups.model_fields if '__' in name)
+# lookups on the leading column of an index; the others only narrow down the rows an index found
+INDEXED_LOOKUPS = ('technology__in', 'plmn_id__in')
+# request fields served by an index: timestamp, (technology, timestamp), (plmn_id, timestamp),
+# (cell_id, timestamp) and (grid_cell, timestamp) for the location filters
+INDEXED_FIELDS = ('start_date', 'end_date', 'technology', 'plmn_id', 'cell_id', 'bbox', 'radius')
+# indexed request fields whose rows come from several index ranges rather than in timestamp order
+UNORDERED_FIELDS = ('bbox', 'radius')
+# request fields bounding the rows, or selecting one index range that is in timestamp order
+ORDERED_FIELDS = ('start_date', 'end_date', 'technology', 'plmn_id', 'cell_id')
+# lookups on the columns the rollups are grouped by
+ROLLUP_LOOKUPS = tuple(name for name in LOOKUPS if name.split('__')[0] in DIMENSIONS)
+
+
+def lookups(request: interfaces.MeasurementLookups) -> Dict[str, Any]:
+    """The declarative filters set on request, as Django lookups"""
+    return {name: getattr(request, name) for name in LOOKUPS if getattr(request, name) is not None}
+
+
+def check_indexed(request: interfaces.MeasurementLookups, chunked: bool = False, bounded: bool = False):
+    """
+    Raise InvalidFilter when the request's filters would make the database scan the whole table, or, for reads
+    in timestamp ordered chunks (exports), sort every remaining row again for each chunk. bounded requests, which
+    read every matching row rather than a page (aggregations over the measurements), need an indexed filter even
+    without lookups.
+    """
+    declared = lookups(request)
+    for name, value in declared.items():
+        if name.endswith('__in'):
+            if not value:
+                raise interfaces.InvalidFilter(f"{name} should list at least one value")
+            if len(value) > MAX_IN_VALUES:
+                raise interfaces.InvalidFilter(f"{name} should list at most {MAX_IN_VALUES} values")
+
+    unindexed = [name for name in declared if name not in INDEXED_LOOKUPS]
+    indexed = [name for name in INDEXED_FIELDS if getattr(request, name, None) is not None] + \
+              [name for name in declared if name in INDEXED_LOOKUPS]
+    if unindexed and not indexed:
+        raise interfaces.InvalidFilter(
+            f"{', '.join(unindexed)} can't be served by an index, "
+            f"combine it with one of: {', '.join(INDEXED_FIELDS + INDEXED_LOOKUPS)}"
+        )
+    if bounded and not indexed:
+        raise interfaces.InvalidFilter(
+            f"this would read every measurement, filter on one of: {', '.join(INDEXED_FIELDS + INDEXED_LOOKUPS)}"
+        )
+
+    if not isinstance(request, interfaces.MeasurementFilter):
+        return  # aggregations have no order to keep
+    if any(getattr(request, name) is not None for name in ORDERED_FIELDS):
+        return
+    # several index ranges can't deliver one timestamp order, so every matching row gets sorted
+    unordered = [name for name in INDEXED_LOOKUPS if len(declared.get(name) or ()) > 1]
+    if chunked:
+        # the location filters read one range of grid cells per row of the grid
+        unordered += [name for name in UNORDERED_FIELDS if getattr(request, name) is not None]
+        if unordered:
+            raise interfaces.InvalidFilter(
+                f"{', '.join(unordered)} can't be read in timestamp order, "
+                f"combine it with one of: {', '.join(ORDERED_FIELDS)}"
+            )
+    for name in unordered:
+        logger.warning(f"{name}={declared[name]} without a date range sorts all of its rows")
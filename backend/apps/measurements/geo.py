@@ -0,0 +1,161 @@
+"""
+Grid cells for location filters and map tile binning.
+
+MySQL can't put a SPATIAL index on a partitioned table, so every measurement stores the cell of a fixed
+0.01° latitude/longitude grid it falls into (``grid_cell``, computed at ingest and indexed). Cells are numbered
+row by row, south to north and west to east within a row, so the cells of a bounding box are one contiguous
+``grid_cell`` range per grid row: a map viewport over a city costs a handful of index range scans, after which the
+exact latitude/longitude (or distance) condition only looks at the rows in those cells. Queries ordered by
+timestamp are pinned to the grid cell index (see use_grid_index), since optimizers otherwise tend to walk the
+timestamp index in order and test every row against the box.
+"""
+import math
+from typing import List, Optional, Tuple
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Floor, Ln, Power, Radians, Sin, Sqrt, Tan
+from django.db.models.sql.datastructures import BaseTable
+
+GRID_CELLS_PER_DEGREE = 100
+GRID_COLUMNS = 360 * GRID_CELLS_PER_DEGREE + 1  # longitude 180 gets its own column
+MAX_GRID_RANGES = 100  # taller boxes are scanned as one range from their first to their last cell
+EARTH_RADIUS_METERS = 6371008.8
+MAX_TILE_ZOOM = 22
+TILE_SIZE = 256  # pixels
+MAX_MERCATOR_LATITUDE = 85.0511287798
+GRID_INDEX = 'measurements_grid_ts_idx'
+
+
+def _grid_row(latitude: float) -> int:
+    return math.floor((latitude + 90) * GRID_CELLS_PER_DEGREE)
+
+
+def _grid_column(longitude: float) -> int:
+    return math.floor((longitude + 180) * GRID_CELLS_PER_DEGREE)
+
+
+def grid_cell(latitude: Optional[float], longitude: Optional[float]) -> Optional[int]:
+    if latitude is None or longitude is None:
+        return None
+    return _grid_row(latitude) * GRID_COLUMNS + _grid_column(longitude)
+
+
+def grid_cell_expression(latitude='latitude', longitude='longitude'):
+    """grid_cell() as a database expression, for backfilling existing rows"""
+    return (Floor((F(latitude) + 90) * GRID_CELLS_PER_DEGREE) * GRID_COLUMNS +
+            Floor((F(longitude) + 180) * GRID_CELLS_PER_DEGREE))
+
+
+def grid_ranges(min_longitude: float, min_latitude: float,
+                max_longitude: float, max_latitude: float) -> List[Tuple[int, int]]:
+    """Inclusive grid_cell ranges covering the bounding box"""
+    first_row, last_row = _grid_row(min_latitude), _grid_row(max_latitude)
+    first_column, last_column = _grid_column(min_longitude), _grid_column(max_longitude)
+    if last_row - first_row >= MAX_GRID_RANGES:
+        return [(first_row * GRID_COLUMNS + first_column, last_row * GRID_COLUMNS + last_column)]
+    return [(row * GRID_COLUMNS + first_column, row * GRID_COLUMNS + last_column)
+            for row in range(first_row, last_row + 1)]
+
+
+def bounding_box_filter(min_longitude: float, min_latitude: float, max_longitude: float, max_latitude: float) -> Q:
+    cells = Q()
+    for first, last in grid_ranges(min_longitude, min_latitude, max_longitude, max_latitude):
+        cells |= Q(grid_cell__range=(first, last))
+    return cells & Q(latitude__range=(min_latitude, max_latitude), longitude__range=(min_longitude, max_longitude))
+
+
+class _IndexHintTable(BaseTable):
+    """The FROM clause table of a query, with a hint naming the index it must be read through"""
+
+    def __init__(self, table_name, alias, index_name):
+        super().__init__(table_name, alias)
+        self.index_name = index_name
+
+    def as_sql(self, compiler, connection):
+        sql, params = super().as_sql(compiler, connection)
+        if connection.vendor == 'mysql':
+            return f"{sql} FORCE INDEX ({connection.ops.quote_name(self.index_name)})", params
+        if connection.vendor == 'sqlite':
+            return f"{sql} INDEXED BY {connection.ops.quote_name(self.index_name)}", params
+        return sql, params
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(self.table_name, change_map.get(self.table_alias, self.table_alias), self.index_name)
+
+
+def use_grid_index(queryset):
+    """The queryset, read through the grid cell index; only for querysets filtered by bounding_box_filter()"""
+    queryset = queryset.all()
+    alias = queryset.query.get_initial_alias()
+    queryset.query.alias_map[alias] = _IndexHintTable(queryset.query.alias_map[alias].table_name, alias, GRID_INDEX)
+    return queryset
+
+
+def radius_bounding_box(latitude: float, longitude: float, meters: float) -> Tuple[float, float, float, float]:
+    """(min_longitude, min_latitude, max_longitude, max_latitude) of a box containing the circle"""
+    latitude_delta = math.degrees(meters / EARTH_RADIUS_METERS)
+    min_latitude, max_latitude = max(latitude - latitude_delta, -90.0), min(latitude + latitude_delta, 90.0)
+    widest = max(abs(min_latitude), abs(max_latitude))
+    if widest >= 90 or latitude_delta >= 90:
+        return -180.0, min_latitude, 180.0, max_latitude
+    longitude_delta = math.degrees(meters / (EARTH_RADIUS_METERS * math.cos(math.radians(widest))))
+    if longitude_delta >= 180:
+        return -180.0, min_latitude, 180.0, max_latitude
+    # circles crossing the antimeridian are clamped to it
+    return max(longitude - longitude_delta, -180.0), min_latitude, min(longitude + longitude_delta, 180.0), max_latitude
+
+
+def distance_expression(latitude: float, longitude: float):
+    """Haversine distance in meters from (latitude, longitude) to each row's location"""
+    def half_angle_sine_squared(delta):
+        return Power(Sin(delta / 2), 2)
+
+    point_latitude = Value(math.radians(latitude), output_field=FloatField())
+    row_latitude = Radians('latitude')
+    return Value(2 * EARTH_RADIUS_METERS) * ASin(Sqrt(
+        half_angle_sine_squared(row_latitude - point_latitude) +
+        Cos(point_latitude) * Cos(row_latitude) *
+        half_angle_sine_squared(Radians('longitude') - Value(math.radians(longitude), output_field=FloatField()))
+    ))
+
+
+def world_x(longitude: float) -> float:
+    """Web mercator x of a longitude, from 0 at the antimeridian's west side to 1"""
+    return (longitude + 180) / 360
+
+
+def world_y(latitude: float) -> float:
+    """Web mercator y of a latitude, from 0 at the north edge of the map to 1"""
+    latitude = math.radians(max(min(latitude, MAX_MERCATOR_LATITUDE), -MAX_MERCATOR_LATITUDE))
+    return (1 - math.log(math.tan(latitude) + 1 / math.cos(latitude)) / math.pi) / 2
+
+
+def _tile_latitude(y: float, zoom: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2 ** zoom))))
+
+
+def tile_bounding_box(zoom: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_longitude, min_latitude, max_longitude, max_latitude) of a slippy map (web mercator) tile"""
+    tiles = 2 ** zoom
+    return x / tiles * 360 - 180, _tile_latitude(y + 1, zoom), (x + 1) / tiles * 360 - 180, _tile_latitude(y, zoom)
+
+
+def world_bin_expressions(bins: float):
+    """
+    Database expressions for the column and row of the bins x bins web mercator grid over the whole map
+    each row falls into, counted from the north-west corner.
+    """
+    column = Floor((F('longitude') + 180) * (bins / 360))
+    latitude = Radians('latitude')
+    mercator = Ln(Tan(latitude) + Value(1.0) / Cos(latitude))
+    row = Floor((Value(1.0) - mercator / math.pi) * (bins / 2))
+    return column, row
+
+
+def tile_bin_expressions(zoom: int, x: int, y: int, bins: int):
+    """
+    Database expressions for the column and row of the bins x bins grid over a tile each row falls into,
+    counted from the tile's north-west corner like tile coordinates. Rows on the tile's east or south edge
+    get index `bins`, as they belong to the neighbouring tile.
+    """
+    column, row = world_bin_expressions(2 ** zoom * bins)
+    return column - x * bins, row - y * bins
@@ -1,6 +1,6 @@
 from .dataclasses import *
 from abc import ABC, abstractmethod
-from typing import List
+from typing import BinaryIO, Iterator, List, Optional
 
 
 class AbstractMeasurementService(ABC):
@@ -12,23 +12,140 @@ class AbstractMeasurementService(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def get_measurement(self, measurement_id: int) -> MeasurementDTO:
+    def enqueue_measurement(self, request: CreateMeasurementReq, durable: bool = True) -> Optional[MeasurementDTO]:
+        """
+        Create a measurement through the write-behind buffer, which flushes buffered rows as
+        multi-row inserts. With durable=True wait for the flush and return the measurement,
+        otherwise return None as soon as the row is buffered. Without a write-behind buffer
+        this is the same as create_measurement.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_measurement(self, measurement_id: int, fields: Optional[List[str]] = None) -> MeasurementDTO:
         """
         Get measurement data by ID.
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def get_measurement_json(self, measurement_id: int, fields: Optional[List[str]] = None) -> bytes:
+        """
+        Same as get_measurement, encoded straight from the database row to JSON bytes.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_measurements_json(self, request: MeasurementListReq) -> bytes:
+        """
+        Same as list_measurements, encoded straight from the database rows to JSON bytes
+        identical to the rendered MeasurementListResponse.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_measurements(self, request: MeasurementListReq, output: ExportFormat) -> Iterator[bytes]:
+        """
+        Stream every measurement matching the list filters (and fields) as CSV, NDJSON, Parquet or
+        Arrow IPC chunks, oldest first. Rows are read in bounded keyset batches, so memory stays flat
+        for any size.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def list_measurements(self, request: MeasurementListReq) -> MeasurementListResponse:
         """
         List measurements with optional filtering and pagination.
+        Pages are ordered by (timestamp, id) descending; passing a returned next/prev cursor
+        seeks from that position instead of skipping offset rows. With request.fields only those
+        columns are selected and returned. The total is counted exactly,
+        estimated from the optimizer's statistics or skipped, depending on request.count.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def aggregate_measurements(self, request: MeasurementAggregateReq) -> MeasurementAggregateResponse:
+        """
+        Count measurements matching the list filters and compute avg/min/max of the requested metrics
+        in the database, grouped by the requested dimensions and time bucket.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_cell_summaries(self, request: CellSummaryReq) -> CellSummaryListResponse:
+        """
+        Return the maintained summaries of the cells matching the identity filters: sample count, first and
+        last seen, signal and throughput distributions and the frequency bands and ARFCNs observed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_heatmap_tile(self, request: HeatmapTileReq) -> HeatmapTileResponse:
+        """
+        Bin the measurements inside a slippy map tile into a fixed grid and return the sample count and mean
+        rsrp and download_rate of every non-empty bin. Tiles are cached per tile and filters.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def cluster_measurements(self, request: MeasurementClusterReq) -> MeasurementClusterResponse:
+        """
+        Cluster the measurements inside a bounding box on a screen space grid for the zoom level and return
+        every cluster's centroid, count and metric summary. The grid is coarsened until the bbox can't produce
+        more than request.max_clusters clusters, however many measurements match.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def bulk_create_measurements(self, request: BulkCreateMeasurementReq,
+                                 response_mode: BulkResponseMode = 'summary') -> BulkCreateMeasurementResponse:
+        """
+        Create multiple measurements with chunked multi-row inserts.
+        Each chunk is committed in its own transaction. Readings already stored are ignored
+        and a batch_id that was already ingested makes the call a no-op.
+        response_mode 'summary' returns counts and the created id range, 'ids' adds the created ids
+        and 'full' echoes every created measurement. Ids are only known on backends that return
+        primary keys from bulk inserts.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def bulk_create_measurements_columnar(self, batch: ColumnarMeasurementBatch,
+                                          response_mode: BulkResponseMode = 'summary') -> BulkCreateMeasurementResponse:
+        """
+        Create measurements decoded from the columnar wire format, validating whole columns
+        at once instead of building a request model per row.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def ingest_measurements_stream(self, stream: BinaryIO, batch_id: Optional[str] = None) -> StreamIngestResponse:
+        """
+        Parse, validate and insert newline-delimited JSON measurements from a binary stream,
+        committing in bounded chunks. Invalid lines are reported instead of aborting the upload.
+        A batch_id that was already ingested makes the call a no-op.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def submit_ingestion_job(self, payload: dict) -> IngestionJobDTO:
+        """
+        Stage a bulk upload in the ingestion queue and return the pending job.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_ingestion_job(self, job_id: int) -> IngestionJobDTO:
+        """
+        Get the status of an ingestion job by ID.
         """
         raise NotImplementedError
 
     @abstractmethod
-    def bulk_create_measurements(self, request: BulkCreateMeasurementReq) -> BulkCreateMeasurementResponse:
+    def process_next_ingestion_job(self) -> Optional[IngestionJobDTO]:
         """
-        Create multiple measurements in a single transaction.
+        Claim the oldest pending ingestion job, insert its rows and return the finished job.
+        Returns None when the queue is empty.
         """
         raise NotImplementedError
 
@@ -1,10 +1,11 @@
 from libs import dataclasses
-from typing import List, Optional
+from pydantic import Field, model_validator
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
 
 class MeasurementDTO(dataclasses.BaseModel):
-    id: int
+    id: Optional[int] = None
     timestamp: datetime
     latitude: float | None = None
     longitude: float | None = None
@@ -56,23 +57,283 @@ class CreateMeasurementReq(dataclasses.BaseModel):
     sms_delivery_time: Optional[float] = None
 
 
-class MeasurementListReq(dataclasses.BaseModel):
+class BoundingBox(dataclasses.BaseModel):
+    min_longitude: float = Field(ge=-180, le=180)
+    min_latitude: float = Field(ge=-90, le=90)
+    max_longitude: float = Field(ge=-180, le=180)
+    max_latitude: float = Field(ge=-90, le=90)
+
+    @model_validator(mode='after')
+    def check_corners(self):
+        if self.min_longitude > self.max_longitude or self.min_latitude > self.max_latitude:
+            raise ValueError("bbox should be min_longitude,min_latitude,max_longitude,max_latitude")
+        return self
+
+
+class RadiusFilter(dataclasses.BaseModel):
+    latitude: float = Field(ge=-90, le=90)
+    longitude: float = Field(ge=-180, le=180)
+    meters: float = Field(gt=0)
+
+
+CountMode = Literal['exact', 'estimated', 'none']
+ExportFormat = Literal['csv', 'ndjson', 'parquet', 'arrow']
+
+
+MeasurementOrder = Literal['-timestamp', 'timestamp']
+
+
+# every field named like a Django lookup (`rsrp__lte`, `technology__in`) filters on that lookup when set,
+# see filters.py for which combinations are accepted
+class MeasurementLookups(dataclasses.BaseModel):
+    technology__in: Optional[List[str]] = None
+    plmn_id__in: Optional[List[str]] = None
+    frequency_band__in: Optional[List[str]] = None
+    rsrp__gte: Optional[float] = None
+    rsrp__lte: Optional[float] = None
+    rsrq__gte: Optional[float] = None
+    rsrq__lte: Optional[float] = None
+    rscp__gte: Optional[float] = None
+    rscp__lte: Optional[float] = None
+    ec_no__gte: Optional[float] = None
+    ec_no__lte: Optional[float] = None
+    rxlev__gte: Optional[float] = None
+    rxlev__lte: Optional[float] = None
+    download_rate__gte: Optional[float] = None
+    download_rate__lte: Optional[float] = None
+    upload_rate__gte: Optional[float] = None
+    upload_rate__lte: Optional[float] = None
+    ping_response_time__gte: Optional[float] = None
+    ping_response_time__lte: Optional[float] = None
+    dns_response_time__gte: Optional[float] = None
+    dns_response_time__lte: Optional[float] = None
+    web_response_time__gte: Optional[float] = None
+    web_response_time__lte: Optional[float] = None
+    sms_delivery_time__gte: Optional[float] = None
+    sms_delivery_time__lte: Optional[float] = None
+
+
+class MeasurementFilter(dataclasses.BaseFilter, MeasurementLookups):
+    order_by: MeasurementOrder = '-timestamp'
+
+
+class MeasurementListReq(MeasurementFilter):
     technology: Optional[str] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    bbox: Optional[BoundingBox] = None
+    radius: Optional[RadiusFilter] = None  # measurements within meters of a point
+    plmn_id: Optional[str] = None
+    lac: Optional[int] = None
+    tac: Optional[int] = None
+    cell_id: Optional[int] = None
     limit: Optional[int] = 100
     offset: Optional[int] = 0
+    cursor: Optional[str] = None  # next_cursor/prev_cursor of a previous page; replaces offset
+    count: CountMode = 'exact'
+    fields: Optional[List[str]] = None  # MeasurementDTO fields to return, all when None
 
 
 class MeasurementListResponse(dataclasses.BaseModel):
-    count: int
+    count: Optional[int]
+    count_type: CountMode = 'exact'  # how count was obtained; None when 'none'
     results: List[MeasurementDTO]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+AggregateDimension = Literal['technology', 'plmn_id', 'cell_id', 'arfcn']
+AggregateBucket = Literal['hour', 'day', 'week', 'month']
+AggregateFunction = Literal['avg', 'min', 'max']
+AggregateMetric = Literal[
+    'rsrp', 'rsrq', 'rscp', 'ec_no', 'rxlev', 'download_rate', 'upload_rate',
+    'ping_response_time', 'dns_response_time', 'web_response_time', 'sms_delivery_time',
+]
+
+
+class MeasurementAggregateReq(MeasurementLookups):
+    technology: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    bbox: Optional[BoundingBox] = None
+    radius: Optional[RadiusFilter] = None
+    plmn_id: Optional[str] = None
+    lac: Optional[int] = None
+    tac: Optional[int] = None
+    cell_id: Optional[int] = None
+    group_by: List[AggregateDimension] = []
+    bucket: Optional[AggregateBucket] = None  # also group by the (UTC) hour/day/week/month of timestamp
+    metrics: List[AggregateMetric] = []
+    aggregates: List[AggregateFunction] = ['avg', 'min', 'max']
+    limit: int = Field(default=1000, ge=1, le=10000)  # maximum number of groups
+
+
+class MeasurementAggregateResponse(dataclasses.BaseModel):
+    # one dict per group: the group_by values, 'bucket', 'count' and '<metric>_<aggregate>' values
+    groups: List[Dict[str, Any]]
+    truncated: bool = False  # more groups than limit matched
+
+
+class CellSummaryReq(dataclasses.BaseModel):
+    plmn_id: Optional[str] = None
+    lac: Optional[int] = None
+    tac: Optional[int] = None
+    cell_id: Optional[int] = None
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class MetricSummary(dataclasses.BaseModel):
+    count: int
+    avg: float
+    min: float
+    max: float
+    bin_width: float
+    histogram: Dict[str, int]  # number of values per bin, keyed by the bin's lower bound
+
+
+class CellSummaryDTO(dataclasses.BaseModel):
+    plmn_id: Optional[str] = None
+    lac: Optional[int] = None
+    tac: Optional[int] = None
+    cell_id: Optional[int] = None
+    technology: Optional[str] = None  # of the latest measurement
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    metrics: Dict[str, MetricSummary]
+    frequency_bands: Dict[str, int]  # number of measurements per band
+    arfcns: Dict[str, int]  # number of measurements per ARFCN
+
+
+class CellSummaryListResponse(dataclasses.BaseModel):
+    results: List[CellSummaryDTO]
+    truncated: bool = False  # more cells than limit matched
+
+
+class HeatmapTileReq(MeasurementLookups):
+    zoom: int = Field(ge=0, le=22)
+    x: int = Field(ge=0)
+    y: int = Field(ge=0)
+    technology: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+    @model_validator(mode='after')
+    def check_tile(self):
+        if self.x >= 2 ** self.zoom or self.y >= 2 ** self.zoom:
+            raise ValueError(f"x and y should be less than {2 ** self.zoom} at zoom {self.zoom}")
+        return self
+
+
+class HeatmapCell(dataclasses.BaseModel):
+    x: int  # column of the bin within the tile, from the west edge
+    y: int  # row of the bin within the tile, from the north edge
+    count: int
+    rsrp_avg: Optional[float] = None
+    download_rate_avg: Optional[float] = None
+
+
+class HeatmapTileResponse(dataclasses.BaseModel):
+    zoom: int
+    x: int
+    y: int
+    bins: int  # the tile is split into bins x bins cells; only cells with measurements are listed
+    cells: List[HeatmapCell]
+
+
+class MeasurementClusterReq(MeasurementLookups):
+    bbox: BoundingBox
+    zoom: int = Field(ge=0, le=22)
+    technology: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    max_clusters: int = Field(default=500, ge=4, le=5000)
+
+
+class MeasurementCluster(dataclasses.BaseModel):
+    latitude: float  # centroid
+    longitude: float
+    count: int
+    id: Optional[int] = None  # the measurement itself when the cluster holds a single one
+    rsrp_avg: Optional[float] = None
+    rsrp_min: Optional[float] = None
+    rsrp_max: Optional[float] = None
+    download_rate_avg: Optional[float] = None
+
+
+class MeasurementClusterResponse(dataclasses.BaseModel):
+    zoom: int
+    cell_pixels: int  # size of the screen grid the measurements were clustered on
+    count: int  # measurements inside the bbox
+    clusters: List[MeasurementCluster]
 
 
 class BulkCreateMeasurementReq(dataclasses.BaseModel):
-    measurements: List[CreateMeasurementReq]
+    batch_id: Optional[dataclasses.UUIDField] = None
+    measurements: list  # raw rows, validated in bulk by the service
+
+
+class ColumnarMeasurementBatch(dataclasses.BaseModel):
+    batch_id: Optional[dataclasses.UUIDField] = None
+    count: int = Field(ge=0)
+    columns: Dict[str, list]
+    nulls: Dict[str, bytes] = {}
+
+
+class BulkInsertBatchReport(dataclasses.BaseModel):
+    index: int
+    size: int
+    duplicate_count: int = 0
+    duration_ms: float
+
+
+class IngestLineError(dataclasses.BaseModel):
+    line: int
+    errors: List[str]
+
+
+BulkResponseMode = Literal['summary', 'ids', 'full']
 
 
 class BulkCreateMeasurementResponse(dataclasses.BaseModel):
     created_count: int
-    results: List[MeasurementDTO] 
\ No newline at end of file
+    skipped_count: int = 0
+    duplicate_count: int = 0
+    invalid_count: int = 0
+    duplicate_batch: bool = False
+    errors: List[IngestLineError] = []
+    first_id: Optional[int] = None
+    last_id: Optional[int] = None
+    ids: Optional[List[int]] = None
+    results: Optional[List[MeasurementDTO]] = None
+    batches: List[BulkInsertBatchReport] = [] 
+
+
+class StreamIngestResponse(dataclasses.BaseModel):
+    received_count: int
+    created_count: int
+    skipped_count: int
+    duplicate_count: int = 0
+    error_count: int
+    batch_count: int
+    duplicate_batch: bool = False
+    errors: List[IngestLineError]
+
+
+class IngestionJobDTO(dataclasses.BaseModel):
+    id: int
+    batch_id: Optional[str] = None
+    status: str
+    attempts: int
+    received_count: int
+    created_count: int
+    skipped_count: int
+    duplicate_count: int
+    error_count: int
+    errors: List[IngestLineError]
+    error_message: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
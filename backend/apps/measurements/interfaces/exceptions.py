@@ -1,8 +1,35 @@
-from libs.exceptions import NotFoundRoot, BadRequestRoot
+from libs.exceptions import NotFoundRoot, BadRequestRoot, ServiceUnavailableRoot, TooManyRequestRoot
 
 
 class MeasurementNotFound(NotFoundRoot):
     pass
 
 class BulkCreateError(BadRequestRoot):
-    pass 
+    pass
+
+class IngestionJobNotFound(NotFoundRoot):
+    pass
+
+class InvalidIngestionPayload(BadRequestRoot):
+    pass
+
+class InvalidMeasurement(BadRequestRoot):
+    pass
+
+class WriteBehindBufferFull(TooManyRequestRoot):
+    pass
+
+class WriteBehindTimeout(ServiceUnavailableRoot):
+    pass
+
+class InvalidListCursor(BadRequestRoot):
+    pass
+
+class InvalidFieldSelection(BadRequestRoot):
+    pass
+
+class InvalidAggregation(BadRequestRoot):
+    pass
+
+class InvalidFilter(BadRequestRoot):
+    pass
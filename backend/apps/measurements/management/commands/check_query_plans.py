@@ -0,0 +1,134 @@
+import logging
+from datetime import timedelta
+from typing import Callable, List, Tuple
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.measurements import geo, interfaces
+from apps.measurements.services import MeasurementService
+
+logger = logging.getLogger(__name__)
+
+# unfiltered ORDER BY ... LIMIT pages (and their counts), which read the timestamp index from one end by design;
+# every other scenario fails on a full index scan as well as on a full table scan
+UNFILTERED_PAGE_SCENARIOS = ('list', 'list page by cursor')
+# GROUP BY scenarios, which may sort their groups (not the rows they read) in a temporary table
+GROUPING_SCENARIOS = (
+    'aggregate from rollups', 'aggregate by technology', 'aggregate by date range', 'heatmap tile', 'clusters',
+)
+# location scenarios, which read one grid cell index range per grid row of the box and sort only the rows in them
+SPATIAL_SCENARIOS = ('list by bbox', 'list by radius')
+
+
+def _read_scenarios() -> List[Tuple[str, Callable[[interfaces.AbstractMeasurementService], object]]]:
+    now = timezone.now()
+    week_ago = now - timedelta(days=7)
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start - timedelta(microseconds=1)
+    return [
+        ("list", lambda service: service.list_measurements(interfaces.MeasurementListReq())),
+        ("list by technology", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(technology='LTE'))),
+        ("list by date range", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(start_date=week_ago, end_date=now))),
+        ("list by technology and date range", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(technology='LTE', start_date=week_ago, end_date=now))),
+        ("list page by cursor", lambda service: service.list_measurements(interfaces.MeasurementListReq(
+            cursor=service.list_measurements(interfaces.MeasurementListReq(limit=1)).next_cursor))),
+        ("list by cell", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(plmn_id='43211', cell_id=1))),
+        ("list by plmn_id", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(plmn_id='43211'))),
+        ("list by technology and rsrp range", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(technology='LTE', rsrp__gte=-110, rsrp__lte=-90))),
+        ("list oldest first", lambda service: service.list_measurements(
+            interfaces.MeasurementListReq(technology='LTE', order_by='timestamp'))),
+        ("list by bbox", lambda service: service.list_measurements(interfaces.MeasurementListReq(
+            bbox=interfaces.BoundingBox(min_longitude=51.3, min_latitude=35.6, max_longitude=51.5, max_latitude=35.8)))),
+        ("list by radius", lambda service: service.list_measurements(interfaces.MeasurementListReq(
+            radius=interfaces.RadiusFilter(latitude=35.7, longitude=51.4, meters=2000)))),
+        ("cell summaries", lambda service: service.list_cell_summaries(
+            interfaces.CellSummaryReq(plmn_id='43211', cell_id=1))),
+        ("export by technology", lambda service: b''.join(service.export_measurements(
+            interfaces.MeasurementListReq(technology='LTE'), 'csv'))),
+        ("aggregate from rollups", lambda service: service.aggregate_measurements(interfaces.MeasurementAggregateReq(
+            group_by=['technology'], metrics=['rsrp'], start_date=day_start - timedelta(days=7), end_date=day_end))),
+        ("aggregate by technology", lambda service: service.aggregate_measurements(interfaces.MeasurementAggregateReq(
+            technology='LTE', group_by=['arfcn'], metrics=['rsrp']))),
+        ("aggregate by date range", lambda service: service.aggregate_measurements(interfaces.MeasurementAggregateReq(
+            start_date=week_ago, end_date=now, bucket='day', metrics=['download_rate']))),
+        ("heatmap tile", lambda service: service.get_heatmap_tile(interfaces.HeatmapTileReq(
+            zoom=12, x=int(geo.world_x(51.4) * 2 ** 12), y=int(geo.world_y(35.7) * 2 ** 12)))),
+        ("clusters", lambda service: service.cluster_measurements(interfaces.MeasurementClusterReq(
+            bbox=interfaces.BoundingBox(min_longitude=51.2, min_latitude=35.5, max_longitude=51.6, max_latitude=35.9),
+            zoom=11))),
+        ("retrieve", lambda service: service.get_measurement(1)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the queries issued by the measurement read paths and fail when any of them "
+        "falls back to a full table or index scan or a filesort. Run it against a database holding realistic data, "
+        "since optimizers may prefer a scan over an index on near-empty tables."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('mysql', 'sqlite'):
+            raise CommandError(f"Query plan checks are not supported on {connection.vendor}")
+
+        # without the response cache, whose hits would hide the queries
+        service = MeasurementService()
+        failures = []
+        for name, scenario in _read_scenarios():
+            with CaptureQueriesContext(connection) as context:
+                try:
+                    scenario(service)
+                except interfaces.MeasurementNotFound:
+                    pass
+
+            for query in context.captured_queries:
+                if not query['sql'].lstrip().upper().startswith('SELECT'):
+                    continue
+                problems = self._explain(query['sql'], allow_index_scan=name in UNFILTERED_PAGE_SCENARIOS,
+                                         allow_grouping=name in GROUPING_SCENARIOS,
+                                         allow_sort=name in SPATIAL_SCENARIOS)
+                if problems:
+                    failures.append(f"{name}: {'; '.join(problems)}\n    {query['sql']}")
+                else:
+                    self.stdout.write(f"ok   {name}: {query['sql'][:120]}")
+
+        if failures:
+            for failure in failures:
+                self.stderr.write(f"FAIL {failure}")
+            raise CommandError(f"{len(failures)} measurement queries regressed to a full scan")
+        self.stdout.write(self.style.SUCCESS("All measurement queries use an index"))
+
+    @staticmethod
+    def _explain(sql: str, allow_index_scan: bool = False, allow_grouping: bool = False,
+                 allow_sort: bool = False) -> List[str]:
+        problems = []
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute(f"EXPLAIN {sql}")
+                columns = [column[0].lower() for column in cursor.description]
+                for row in cursor.fetchall():
+                    plan = dict(zip(columns, row))
+                    if plan['type'] == 'ALL':
+                        problems.append(f"full scan of {plan['table']}")
+                    if plan['type'] == 'index' and not allow_index_scan:
+                        problems.append(f"full index scan of {plan['table']} using {plan['key']}")
+                    grouped = allow_grouping and 'Using temporary' in (plan['extra'] or '')
+                    if 'Using filesort' in (plan['extra'] or '') and not (grouped or allow_sort):
+                        problems.append(f"filesort on {plan['table']}")
+            else:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    if detail.startswith('SCAN') and ('USING' not in detail or not allow_index_scan):
+                        problems.append(detail.lower())
+                    # the b-trees of a grouping query collect and order its groups
+                    if 'TEMP B-TREE' in detail and not (allow_grouping or allow_sort and 'ORDER BY' in detail):
+                        problems.append(detail.lower())
+        return problems
@@ -0,0 +1,42 @@
+import logging
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from apps.measurements import interfaces
+from runner.bootstrap import get_bootstrapper
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Export measurements matching the list filters to a Parquet, Arrow IPC, CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to write")
+        parser.add_argument('--output', choices=['parquet', 'arrow', 'csv', 'ndjson'], default='parquet')
+        parser.add_argument('--technology')
+        parser.add_argument('--start-date', type=datetime.fromisoformat, help="ISO 8601, inclusive")
+        parser.add_argument('--end-date', type=datetime.fromisoformat, help="ISO 8601, inclusive")
+        parser.add_argument('--fields', help="Comma separated measurement fields (default: all)")
+
+    def handle(self, *args, **options):
+        service = get_bootstrapper().get_measurements_service()
+        fields = [field.strip() for field in (options['fields'] or '').split(',') if field.strip()]
+        try:
+            chunks = service.export_measurements(
+                interfaces.MeasurementListReq(
+                    technology=options['technology'],
+                    start_date=options['start_date'],
+                    end_date=options['end_date'],
+                    fields=fields or None,
+                ),
+                output=options['output'],
+            )
+        except interfaces.InvalidFieldSelection as e:
+            raise CommandError(str(e))
+
+        size = 0
+        with open(options['path'], 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+                size += len(chunk)
+        self.stdout.write(f"Wrote {size} bytes of {options['output']} to {options['path']}")
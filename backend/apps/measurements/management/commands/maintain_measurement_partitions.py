@@ -0,0 +1,85 @@
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from apps.measurements import cells, partitions, rollups
+from apps.measurements.models import MeasurementDailyRollup
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Pre-create future monthly partitions of the measurements table and drop or archive expired ones, "
+        "along with their months' rollups and their cells' share of the cell summaries"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3,
+                            help="Number of future months that should already have a partition")
+        parser.add_argument('--retention-months', type=int, default=None,
+                            help="Drop partitions of months older than this many months (default: keep everything)")
+        parser.add_argument('--archive', action='store_true',
+                            help="Move expired partitions into measurements_archive_pYYYYMM tables instead of dropping them")
+        parser.add_argument('--dry-run', action='store_true', help="Only print what would be changed")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'mysql':
+            raise CommandError("Partition maintenance requires MySQL")
+        existing = partitions.list_partitions(connection)
+        if not existing:
+            raise CommandError("The measurements table is not partitioned, run the migrations first")
+
+        this_month = partitions.month_start(timezone.now().date())
+        monthly = [partition for partition in existing if partition.month is not None]
+        last_month = monthly[-1].month if monthly else partitions.month_start(this_month, -1)
+
+        new_months = []
+        month = partitions.month_start(last_month, 1)
+        while month <= partitions.month_start(this_month, options['months_ahead']):
+            new_months.append(month)
+            month = partitions.month_start(month, 1)
+
+        if new_months:
+            self.stdout.write(f"Creating partitions: {', '.join(map(partitions.partition_name, new_months))}")
+            if not options['dry_run']:
+                partitions.add_partitions(connection, new_months)
+
+        if options['retention_months'] is None:
+            return
+        if options['retention_months'] < 1:
+            raise CommandError("--retention-months should be greater than 0")
+
+        oldest_kept = partitions.month_start(this_month, -options['retention_months'])
+        for partition in monthly:
+            if partition.month >= oldest_kept:
+                break
+            if options['archive']:
+                self.stdout.write(f"Archiving partition {partition.name}")
+                if not options['dry_run']:
+                    archive_table = partitions.archive_partition(connection, partition)
+                    logger.info(f"Archived partition {partition.name} into {archive_table}")
+                    self._remove_month(partition)
+            else:
+                self.stdout.write(f"Dropping partition {partition.name}")
+                if not options['dry_run']:
+                    partitions.drop_partition(connection, partition)
+                    logger.info(f"Dropped partition {partition.name}")
+                    self._remove_month(partition)
+
+    def _remove_month(self, partition: partitions.Partition):
+        """
+        Delete the rollups of a dropped or archived partition's month and rebuild the summaries of the cells
+        measured in it from their remaining measurements
+        """
+        start = datetime(partition.month.year, partition.month.month, 1, tzinfo=dt_timezone.utc)
+        next_month = partitions.month_start(partition.month, 1)
+        end = datetime(next_month.year, next_month.month, 1, tzinfo=dt_timezone.utc)
+        with transaction.atomic():
+            cell_ids = set(MeasurementDailyRollup.objects.filter(bucket__gte=start, bucket__lt=end)
+                           .values_list('cell_id', flat=True).distinct())
+            for model, _ in rollups.GRANULARITIES.values():
+                model.objects.filter(bucket__gte=start, bucket__lt=end).delete()
+            rebuilt = cells.rebuild(cell_ids)
+        self.stdout.write(f"Removed the {partition.month:%Y-%m} rollups, rebuilt {rebuilt} cell summaries")
@@ -0,0 +1,33 @@
+import logging
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.measurements import cells
+from apps.measurements.models import Measurement
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-cell summaries from the stored measurements, a batch of cell_ids per transaction. "
+        "Migrating fills them once; run it after deleting measurements outside the API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help="cell_ids per transaction (default: 100)")
+
+    def handle(self, *args, **options):
+        cell_ids = list(Measurement.objects.order_by('cell_id').values_list('cell_id', flat=True).distinct())
+        if not cell_ids:
+            self.stdout.write("No measurements to summarize")
+            return
+
+        total = 0
+        for start in range(0, len(cell_ids), options['batch_size']):
+            batch = cell_ids[start:start + options['batch_size']]
+            with transaction.atomic():
+                written = cells.rebuild(batch)
+            total += written
+            self.stdout.write(f"cell_ids {batch[0]} to {batch[-1]}: {written} summaries")
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} cell summaries"))
@@ -0,0 +1,45 @@
+import logging
+from datetime import datetime, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+from apps.measurements import rollups
+from apps.measurements.models import Measurement
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the hourly and daily measurement rollups from the stored measurements, one UTC day per "
+        "transaction. Migrating fills them once; run it after changing measurements outside the API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start-date', type=datetime.fromisoformat,
+                            help="ISO 8601, first day to rebuild (default: oldest measurement)")
+        parser.add_argument('--end-date', type=datetime.fromisoformat,
+                            help="ISO 8601, last day to rebuild (default: newest measurement)")
+
+    def handle(self, *args, **options):
+        bounds = Measurement.objects.aggregate(first=Min('timestamp'), last=Max('timestamp'))
+        start = options['start_date'] or bounds['first']
+        end = options['end_date'] or bounds['last']
+        if start is None or end is None:
+            self.stdout.write("No measurements to roll up")
+            return
+
+        day = rollups.bucket_start(start, 'day')
+        last_day = rollups.bucket_start(end, 'day')
+        totals = dict.fromkeys(rollups.GRANULARITIES, 0)
+        while day <= last_day:
+            with transaction.atomic():
+                written = rollups.rebuild(day, day)
+            for granularity, count in written.items():
+                totals[granularity] += count
+            self.stdout.write(f"{day:%Y-%m-%d}: {written['hour']} hourly, {written['day']} daily rollups")
+            day += timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {totals['hour']} hourly and {totals['day']} daily rollups"
+        ))
@@ -0,0 +1,65 @@
+import logging
+import signal
+import threading
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from runner.bootstrap import get_bootstrapper
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Run a pool of workers that drain the asynchronous measurement ingestion queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Number of worker threads")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Seconds a worker sleeps when the queue is empty")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once the queue is empty instead of polling forever")
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def request_stop(signum, frame):
+            logger.info(f"Received signal {signum}, stopping ingestion workers after current jobs")
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        workers = [
+            threading.Thread(
+                target=self._work,
+                args=(stop_event, options['poll_interval'], options['once']),
+                name=f"ingestion-worker-{index}",
+            )
+            for index in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} ingestion workers")
+
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(timeout=0.5)
+
+        self.stdout.write("Ingestion workers stopped")
+
+    @staticmethod
+    def _work(stop_event: threading.Event, poll_interval: float, once: bool):
+        service = get_bootstrapper().get_measurements_service()
+        try:
+            while not stop_event.is_set():
+                close_old_connections()
+                try:
+                    job = service.process_next_ingestion_job()
+                except Exception as e:
+                    logger.error(f"Ingestion worker {threading.current_thread().name} failed: {e}")
+                    job = None
+                if job is None:
+                    if once:
+                        return
+                    stop_event.wait(poll_interval)
+        finally:
+            connection.close()
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:27
+
+from django.db import migrations, models
+from django.utils import timezone
+from apps.measurements import partitions
+
+PRE_CREATED_MONTHS = 3
+
+
+def partition_measurements(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'mysql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MIN(`timestamp`) FROM measurements")
+        oldest = cursor.fetchone()[0]
+        # every unique key of a partitioned table has to contain the partitioning column
+        cursor.execute("ALTER TABLE measurements DROP PRIMARY KEY, ADD PRIMARY KEY (id, `timestamp`)")
+
+    this_month = partitions.month_start(timezone.now().date())
+    first_month = partitions.month_start(oldest.date()) if oldest else this_month
+    partitions.partition_table(connection, first_month, partitions.month_start(this_month, PRE_CREATED_MONTHS))
+
+
+def unpartition_measurements(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'mysql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("ALTER TABLE measurements REMOVE PARTITIONING")
+        cursor.execute("ALTER TABLE measurements DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0004_idempotent_ingestion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='measurement',
+            name='dedup_key',
+            field=models.CharField(blank=True, editable=False, max_length=40, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='measurement',
+            constraint=models.UniqueConstraint(fields=('dedup_key', 'timestamp'), name='measurements_dedup_key_uniq'),
+        ),
+        migrations.RunPython(partition_measurements, unpartition_measurements),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0005_partition_measurements_by_month'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(fields=['timestamp'], name='measurements_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(fields=['technology', 'timestamp'], name='measurements_tech_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(fields=['cell_id', 'timestamp'], name='measurements_cell_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,153 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:44
+
+from datetime import timedelta
+from django.db import migrations, models
+from django.db.models import Max, Min
+from apps.measurements import rollups
+
+
+def fill_rollups(apps, schema_editor):
+    Measurement = apps.get_model('measurements', 'Measurement')
+    bounds = Measurement.objects.aggregate(first=Min('timestamp'), last=Max('timestamp'))
+    if bounds['first'] is None:
+        return
+    # one UTC day at a time, so no more than a day of rollups is held in memory
+    day = rollups.bucket_start(bounds['first'], 'day')
+    while day <= bounds['last']:
+        measurements = Measurement.objects.filter(timestamp__gte=day, timestamp__lt=day + timedelta(days=1))
+        for model_name, granularity in (('MeasurementHourlyRollup', 'hour'), ('MeasurementDailyRollup', 'day')):
+            model = apps.get_model('measurements', model_name)
+            model.objects.bulk_create(rollups.build(model, measurements, granularity),
+                                      batch_size=rollups.ROLLUP_BATCH_SIZE)
+        day += timedelta(days=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0006_measurement_read_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeasurementDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rollup_key', models.CharField(editable=False, max_length=40, unique=True)),
+                ('bucket', models.DateTimeField()),
+                ('technology', models.CharField(blank=True, max_length=10, null=True)),
+                ('plmn_id', models.CharField(blank=True, max_length=10, null=True)),
+                ('cell_id', models.IntegerField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('rsrp_count', models.PositiveIntegerField(default=0)),
+                ('rsrp_sum', models.FloatField(blank=True, null=True)),
+                ('rsrp_min', models.FloatField(blank=True, null=True)),
+                ('rsrp_max', models.FloatField(blank=True, null=True)),
+                ('rsrq_count', models.PositiveIntegerField(default=0)),
+                ('rsrq_sum', models.FloatField(blank=True, null=True)),
+                ('rsrq_min', models.FloatField(blank=True, null=True)),
+                ('rsrq_max', models.FloatField(blank=True, null=True)),
+                ('rscp_count', models.PositiveIntegerField(default=0)),
+                ('rscp_sum', models.FloatField(blank=True, null=True)),
+                ('rscp_min', models.FloatField(blank=True, null=True)),
+                ('rscp_max', models.FloatField(blank=True, null=True)),
+                ('ec_no_count', models.PositiveIntegerField(default=0)),
+                ('ec_no_sum', models.FloatField(blank=True, null=True)),
+                ('ec_no_min', models.FloatField(blank=True, null=True)),
+                ('ec_no_max', models.FloatField(blank=True, null=True)),
+                ('rxlev_count', models.PositiveIntegerField(default=0)),
+                ('rxlev_sum', models.FloatField(blank=True, null=True)),
+                ('rxlev_min', models.FloatField(blank=True, null=True)),
+                ('rxlev_max', models.FloatField(blank=True, null=True)),
+                ('download_rate_count', models.PositiveIntegerField(default=0)),
+                ('download_rate_sum', models.FloatField(blank=True, null=True)),
+                ('download_rate_min', models.FloatField(blank=True, null=True)),
+                ('download_rate_max', models.FloatField(blank=True, null=True)),
+                ('upload_rate_count', models.PositiveIntegerField(default=0)),
+                ('upload_rate_sum', models.FloatField(blank=True, null=True)),
+                ('upload_rate_min', models.FloatField(blank=True, null=True)),
+                ('upload_rate_max', models.FloatField(blank=True, null=True)),
+                ('ping_response_time_count', models.PositiveIntegerField(default=0)),
+                ('ping_response_time_sum', models.FloatField(blank=True, null=True)),
+                ('ping_response_time_min', models.FloatField(blank=True, null=True)),
+                ('ping_response_time_max', models.FloatField(blank=True, null=True)),
+                ('dns_response_time_count', models.PositiveIntegerField(default=0)),
+                ('dns_response_time_sum', models.FloatField(blank=True, null=True)),
+                ('dns_response_time_min', models.FloatField(blank=True, null=True)),
+                ('dns_response_time_max', models.FloatField(blank=True, null=True)),
+                ('web_response_time_count', models.PositiveIntegerField(default=0)),
+                ('web_response_time_sum', models.FloatField(blank=True, null=True)),
+                ('web_response_time_min', models.FloatField(blank=True, null=True)),
+                ('web_response_time_max', models.FloatField(blank=True, null=True)),
+                ('sms_delivery_time_count', models.PositiveIntegerField(default=0)),
+                ('sms_delivery_time_sum', models.FloatField(blank=True, null=True)),
+                ('sms_delivery_time_min', models.FloatField(blank=True, null=True)),
+                ('sms_delivery_time_max', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'measurement_rollups_daily',
+                'indexes': [models.Index(fields=['bucket'], name='measurement_rollups_d_idx'), models.Index(fields=['technology', 'bucket'], name='measurement_rollups_d_tech_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MeasurementHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rollup_key', models.CharField(editable=False, max_length=40, unique=True)),
+                ('bucket', models.DateTimeField()),
+                ('technology', models.CharField(blank=True, max_length=10, null=True)),
+                ('plmn_id', models.CharField(blank=True, max_length=10, null=True)),
+                ('cell_id', models.IntegerField(blank=True, null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('rsrp_count', models.PositiveIntegerField(default=0)),
+                ('rsrp_sum', models.FloatField(blank=True, null=True)),
+                ('rsrp_min', models.FloatField(blank=True, null=True)),
+                ('rsrp_max', models.FloatField(blank=True, null=True)),
+                ('rsrq_count', models.PositiveIntegerField(default=0)),
+                ('rsrq_sum', models.FloatField(blank=True, null=True)),
+                ('rsrq_min', models.FloatField(blank=True, null=True)),
+                ('rsrq_max', models.FloatField(blank=True, null=True)),
+                ('rscp_count', models.PositiveIntegerField(default=0)),
+                ('rscp_sum', models.FloatField(blank=True, null=True)),
+                ('rscp_min', models.FloatField(blank=True, null=True)),
+                ('rscp_max', models.FloatField(blank=True, null=True)),
+                ('ec_no_count', models.PositiveIntegerField(default=0)),
+                ('ec_no_sum', models.FloatField(blank=True, null=True)),
+                ('ec_no_min', models.FloatField(blank=True, null=True)),
+                ('ec_no_max', models.FloatField(blank=True, null=True)),
+                ('rxlev_count', models.PositiveIntegerField(default=0)),
+                ('rxlev_sum', models.FloatField(blank=True, null=True)),
+                ('rxlev_min', models.FloatField(blank=True, null=True)),
+                ('rxlev_max', models.FloatField(blank=True, null=True)),
+                ('download_rate_count', models.PositiveIntegerField(default=0)),
+                ('download_rate_sum', models.FloatField(blank=True, null=True)),
+                ('download_rate_min', models.FloatField(blank=True, null=True)),
+                ('download_rate_max', models.FloatField(blank=True, null=True)),
+                ('upload_rate_count', models.PositiveIntegerField(default=0)),
+                ('upload_rate_sum', models.FloatField(blank=True, null=True)),
+                ('upload_rate_min', models.FloatField(blank=True, null=True)),
+                ('upload_rate_max', models.FloatField(blank=True, null=True)),
+                ('ping_response_time_count', models.PositiveIntegerField(default=0)),
+                ('ping_response_time_sum', models.FloatField(blank=True, null=True)),
+                ('ping_response_time_min', models.FloatField(blank=True, null=True)),
+                ('ping_response_time_max', models.FloatField(blank=True, null=True)),
+                ('dns_response_time_count', models.PositiveIntegerField(default=0)),
+                ('dns_response_time_sum', models.FloatField(blank=True, null=True)),
+                ('dns_response_time_min', models.FloatField(blank=True, null=True)),
+                ('dns_response_time_max', models.FloatField(blank=True, null=True)),
+                ('web_response_time_count', models.PositiveIntegerField(default=0)),
+                ('web_response_time_sum', models.FloatField(blank=True, null=True)),
+                ('web_response_time_min', models.FloatField(blank=True, null=True)),
+                ('web_response_time_max', models.FloatField(blank=True, null=True)),
+                ('sms_delivery_time_count', models.PositiveIntegerField(default=0)),
+                ('sms_delivery_time_sum', models.FloatField(blank=True, null=True)),
+                ('sms_delivery_time_min', models.FloatField(blank=True, null=True)),
+                ('sms_delivery_time_max', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'measurement_rollups_hourly',
+                'indexes': [models.Index(fields=['bucket'], name='measurement_rollups_h_idx'), models.Index(fields=['technology', 'bucket'], name='measurement_rollups_h_tech_idx')],
+            },
+        ),
+        migrations.RunPython(fill_rollups, migrations.RunPython.noop),
+    ]
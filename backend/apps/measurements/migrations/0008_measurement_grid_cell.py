@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:47
+
+from django.db import migrations, models
+from apps.measurements import geo
+
+
+def fill_grid_cells(apps, schema_editor):
+    Measurement = apps.get_model('measurements', 'Measurement')
+    Measurement.objects.filter(grid_cell__isnull=True).update(grid_cell=geo.grid_cell_expression())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0007_measurement_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='measurement',
+            name='grid_cell',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_grid_cells, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(fields=['grid_cell', 'timestamp'], name='measurements_grid_ts_idx'),
+        ),
+    ]
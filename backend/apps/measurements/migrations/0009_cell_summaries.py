@@ -0,0 +1,63 @@
+# Generated by Django 5.1.2 on 2026-10-18 20:54
+
+from django.db import migrations, models
+from apps.measurements import cells, rollups
+
+
+def fill_cell_summaries(apps, schema_editor):
+    Measurement = apps.get_model('measurements', 'Measurement')
+    CellSummary = apps.get_model('measurements', 'CellSummary')
+    fields = [field.attname for field in CellSummary._meta.concrete_fields if not field.primary_key]
+    summaries = cells.summarize_stored(Measurement.objects.all()).values()
+    CellSummary.objects.bulk_create(
+        [CellSummary(**{field: getattr(summary, field) for field in fields}) for summary in summaries],
+        batch_size=rollups.ROLLUP_BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('measurements', '0008_measurement_grid_cell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CellSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell_key', models.CharField(editable=False, max_length=40, unique=True)),
+                ('plmn_id', models.CharField(blank=True, max_length=10, null=True)),
+                ('lac', models.IntegerField(blank=True, null=True)),
+                ('tac', models.IntegerField(blank=True, null=True)),
+                ('cell_id', models.IntegerField(blank=True, null=True)),
+                ('technology', models.CharField(blank=True, max_length=10, null=True)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+                ('metrics', models.JSONField(default=dict)),
+                ('frequency_bands', models.JSONField(default=dict)),
+                ('arfcns', models.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'cell_summaries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='measurement',
+            index=models.Index(fields=['plmn_id', 'timestamp'], name='measurements_plmn_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cellsummary',
+            index=models.Index(fields=['cell_id', 'plmn_id'], name='cell_summaries_cell_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cellsummary',
+            index=models.Index(fields=['plmn_id', 'tac'], name='cell_summaries_plmn_tac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cellsummary',
+            index=models.Index(fields=['plmn_id', 'lac'], name='cell_summaries_plmn_lac_idx'),
+        ),
+        migrations.RunPython(fill_cell_summaries, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,8 @@
+import hashlib
+import json
+from datetime import datetime, timezone as dt_timezone
 from django.db import models
+from django.utils import timezone
 
 
 class Measurement(models.Model):
@@ -24,6 +28,11 @@ class Measurement(models.Model):
     dns_response_time = models.FloatField(blank=True, null=True)  # ms
     web_response_time = models.FloatField(blank=True, null=True)  # ms
     sms_delivery_time = models.FloatField(blank=True, null=True)  # seconds
+    # sha1 of the natural key (timestamp, latitude, longitude, cell_id); NULL for rows ingested before dedup.
+    # Unique together with timestamp because the table is partitioned by timestamp (see partitions.py).
+    dedup_key = models.CharField(max_length=40, blank=True, null=True, editable=False)
+    # cell of the 0.01° grid the location falls into, see geo.py; backs the bounding box and radius filters
+    grid_cell = models.IntegerField(blank=True, null=True, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -31,6 +40,208 @@ class Measurement(models.Model):
     class Meta:
         db_table = 'measurements'
         ordering = ['-timestamp']
+        constraints = [
+            models.UniqueConstraint(fields=['dedup_key', 'timestamp'], name='measurements_dedup_key_uniq'),
+        ]
+        # every list filter combination is served by an index that also yields the -timestamp order;
+        # `manage.py check_query_plans` fails when a service query stops using them
+        indexes = [
+            models.Index(fields=['timestamp'], name='measurements_ts_idx'),
+            models.Index(fields=['technology', 'timestamp'], name='measurements_tech_ts_idx'),
+            models.Index(fields=['cell_id', 'timestamp'], name='measurements_cell_ts_idx'),
+            models.Index(fields=['grid_cell', 'timestamp'], name='measurements_grid_ts_idx'),
+            models.Index(fields=['plmn_id', 'timestamp'], name='measurements_plmn_ts_idx'),
+        ]
+
+    @staticmethod
+    def build_dedup_key(timestamp: datetime, latitude: float, longitude: float, cell_id: int | None) -> str:
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp)
+        natural_key = '|'.join((
+            timestamp.astimezone(dt_timezone.utc).isoformat(),
+            f"{latitude:.7f}",
+            f"{longitude:.7f}",
+            '' if cell_id is None else str(cell_id),
+        ))
+        return hashlib.sha1(natural_key.encode()).hexdigest()
+
+    def __str__(self):
+        return f"Measurement at {self.timestamp} - {self.technology} - Lat: {self.latitude}, Lon: {self.longitude}"
+
+
+class MeasurementRollup(models.Model):
+    """
+    Pre-aggregated measurements of one (bucket, technology, plmn_id, cell_id) group. For every metric it keeps
+    the number of non-null values, their sum, min and max, which is all an avg/min/max query needs and can be
+    merged across buckets. Maintained incrementally by the ingest path, see rollups.py.
+    """
+    # sha1 of (bucket, technology, plmn_id, cell_id); the dimensions are nullable, so they can't be the unique key
+    rollup_key = models.CharField(max_length=40, unique=True, editable=False)
+    bucket = models.DateTimeField()  # UTC start of the hour/day
+    technology = models.CharField(max_length=10, blank=True, null=True)
+    plmn_id = models.CharField(max_length=10, blank=True, null=True)
+    cell_id = models.IntegerField(blank=True, null=True)
+    count = models.PositiveIntegerField(default=0)
+    rsrp_count = models.PositiveIntegerField(default=0)
+    rsrp_sum = models.FloatField(blank=True, null=True)
+    rsrp_min = models.FloatField(blank=True, null=True)
+    rsrp_max = models.FloatField(blank=True, null=True)
+    rsrq_count = models.PositiveIntegerField(default=0)
+    rsrq_sum = models.FloatField(blank=True, null=True)
+    rsrq_min = models.FloatField(blank=True, null=True)
+    rsrq_max = models.FloatField(blank=True, null=True)
+    rscp_count = models.PositiveIntegerField(default=0)
+    rscp_sum = models.FloatField(blank=True, null=True)
+    rscp_min = models.FloatField(blank=True, null=True)
+    rscp_max = models.FloatField(blank=True, null=True)
+    ec_no_count = models.PositiveIntegerField(default=0)
+    ec_no_sum = models.FloatField(blank=True, null=True)
+    ec_no_min = models.FloatField(blank=True, null=True)
+    ec_no_max = models.FloatField(blank=True, null=True)
+    rxlev_count = models.PositiveIntegerField(default=0)
+    rxlev_sum = models.FloatField(blank=True, null=True)
+    rxlev_min = models.FloatField(blank=True, null=True)
+    rxlev_max = models.FloatField(blank=True, null=True)
+    download_rate_count = models.PositiveIntegerField(default=0)
+    download_rate_sum = models.FloatField(blank=True, null=True)
+    download_rate_min = models.FloatField(blank=True, null=True)
+    download_rate_max = models.FloatField(blank=True, null=True)
+    upload_rate_count = models.PositiveIntegerField(default=0)
+    upload_rate_sum = models.FloatField(blank=True, null=True)
+    upload_rate_min = models.FloatField(blank=True, null=True)
+    upload_rate_max = models.FloatField(blank=True, null=True)
+    ping_response_time_count = models.PositiveIntegerField(default=0)
+    ping_response_time_sum = models.FloatField(blank=True, null=True)
+    ping_response_time_min = models.FloatField(blank=True, null=True)
+    ping_response_time_max = models.FloatField(blank=True, null=True)
+    dns_response_time_count = models.PositiveIntegerField(default=0)
+    dns_response_time_sum = models.FloatField(blank=True, null=True)
+    dns_response_time_min = models.FloatField(blank=True, null=True)
+    dns_response_time_max = models.FloatField(blank=True, null=True)
+    web_response_time_count = models.PositiveIntegerField(default=0)
+    web_response_time_sum = models.FloatField(blank=True, null=True)
+    web_response_time_min = models.FloatField(blank=True, null=True)
+    web_response_time_max = models.FloatField(blank=True, null=True)
+    sms_delivery_time_count = models.PositiveIntegerField(default=0)
+    sms_delivery_time_sum = models.FloatField(blank=True, null=True)
+    sms_delivery_time_min = models.FloatField(blank=True, null=True)
+    sms_delivery_time_max = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        abstract = True
+
+    @staticmethod
+    def build_rollup_key(bucket: datetime, technology: str | None, plmn_id: str | None, cell_id: int | None) -> str:
+        # JSON keeps NULL and empty dimensions apart
+        group_key = json.dumps([bucket.astimezone(dt_timezone.utc).isoformat(), technology, plmn_id, cell_id])
+        return hashlib.sha1(group_key.encode()).hexdigest()
+
+
+class MeasurementHourlyRollup(MeasurementRollup):
+    class Meta:
+        db_table = 'measurement_rollups_hourly'
+        indexes = [
+            models.Index(fields=['bucket'], name='measurement_rollups_h_idx'),
+            models.Index(fields=['technology', 'bucket'], name='measurement_rollups_h_tech_idx'),
+        ]
+
+    def __str__(self):
+        return f"Hourly rollup {self.bucket} - {self.technology} - {self.plmn_id} - {self.cell_id}"
+
+
+class MeasurementDailyRollup(MeasurementRollup):
+    class Meta:
+        db_table = 'measurement_rollups_daily'
+        indexes = [
+            models.Index(fields=['bucket'], name='measurement_rollups_d_idx'),
+            models.Index(fields=['technology', 'bucket'], name='measurement_rollups_d_tech_idx'),
+        ]
+
+    def __str__(self):
+        return f"Daily rollup {self.bucket} - {self.technology} - {self.plmn_id} - {self.cell_id}"
+
+
+class CellSummary(models.Model):
+    """
+    Running summary of every measurement of one cell, identified by (plmn_id, lac, tac, cell_id). Maintained
+    incrementally by the ingest path, see cells.py.
+    """
+    # sha1 of (plmn_id, lac, tac, cell_id); the identity fields are nullable, so they can't be the unique key
+    cell_key = models.CharField(max_length=40, unique=True, editable=False)
+    plmn_id = models.CharField(max_length=10, blank=True, null=True)
+    lac = models.IntegerField(blank=True, null=True)
+    tac = models.IntegerField(blank=True, null=True)
+    cell_id = models.IntegerField(blank=True, null=True)
+    technology = models.CharField(max_length=10, blank=True, null=True)  # of the latest measurement
+    count = models.PositiveIntegerField(default=0)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+    # {metric: {"count", "sum", "min", "max", "histogram": {bin start: count}}}
+    metrics = models.JSONField(default=dict)
+    frequency_bands = models.JSONField(default=dict)  # {band: count}
+    arfcns = models.JSONField(default=dict)  # {arfcn: count}
+
+    class Meta:
+        db_table = 'cell_summaries'
+        indexes = [
+            models.Index(fields=['cell_id', 'plmn_id'], name='cell_summaries_cell_idx'),
+            models.Index(fields=['plmn_id', 'tac'], name='cell_summaries_plmn_tac_idx'),
+            models.Index(fields=['plmn_id', 'lac'], name='cell_summaries_plmn_lac_idx'),
+        ]
+
+    @staticmethod
+    def build_cell_key(plmn_id: str | None, lac: int | None, tac: int | None, cell_id: int | None) -> str:
+        # JSON keeps NULL and empty identity fields apart
+        return hashlib.sha1(json.dumps([plmn_id, lac, tac, cell_id]).encode()).hexdigest()
+
+    def __str__(self):
+        return f"Cell {self.plmn_id} - {self.lac or self.tac} - {self.cell_id}"
+
+
+class IngestionBatch(models.Model):
+    batch_id = models.CharField(max_length=64, unique=True)
+    created_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'ingestion_batches'
 
     def __str__(self):
-        return f"Measurement at {self.timestamp} - {self.technology} - Lat: {self.latitude}, Lon: {self.longitude}" 
\ No newline at end of file
+        return f"Ingestion batch {self.batch_id}"
+
+
+class IngestionJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        PROCESSING = 'processing'
+        COMPLETED = 'completed'
+        FAILED = 'failed'
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    payload = models.JSONField(default=list)  # staged rows, cleared once the job completes
+    batch_id = models.CharField(max_length=64, blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)  # a crashed worker's job is reclaimed after this
+
+    received_count = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list)
+    error_message = models.TextField(blank=True, null=True)
+
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ingestion_jobs'
+        indexes = [
+            models.Index(fields=['status', 'id'], name='ingestion_jobs_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ingestion job {self.id} - {self.status}"
+
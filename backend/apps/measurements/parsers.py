@@ -0,0 +1,14 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from . import codecs, interfaces
+
+
+class ColumnarMessagePackParser(BaseParser):
+    """Parses the columnar MessagePack upload format into a ColumnarMeasurementBatch"""
+    media_type = codecs.COLUMNAR_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return codecs.decode_columnar(stream.read())
+        except interfaces.InvalidIngestionPayload as e:
+            raise ParseError(str(e))
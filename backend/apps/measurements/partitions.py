@@ -0,0 +1,97 @@
+"""
+Monthly RANGE COLUMNS partitioning of the ``measurements`` table (MySQL only).
+
+Partitions are named ``pYYYYMM`` and hold the rows with ``timestamp`` in that (UTC) month; ``pmax`` catches
+anything past the last pre-created month. Because MySQL requires every unique key of a partitioned table to
+include the partitioning column, the primary key is ``(id, timestamp)`` and dedup keys are unique together
+with ``timestamp``. Filters on ``timestamp`` are pruned to the matching partitions by the optimizer.
+"""
+import logging
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'measurements'
+MAX_PARTITION = 'pmax'
+PARTITION_NAME = re.compile(r'^p(\d{4})(\d{2})$')
+
+
+class Partition(NamedTuple):
+    name: str
+    month: Optional[date]  # first day of the month, None for pmax
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month:%Y%m}"
+
+
+def partition_definition(month: date) -> str:
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ('{month_start(month, 1):%Y-%m-%d}')"
+
+
+def list_partitions(connection) -> List[Partition]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT partition_name FROM information_schema.partitions "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL "
+            "ORDER BY partition_ordinal_position",
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        partitions.append(Partition(name, date(int(match[1]), int(match[2]), 1) if match else None))
+    return partitions
+
+
+def partition_table(connection, first_month: date, last_month: date):
+    """Rebuild the table partitioned by month from first_month through last_month, plus pmax"""
+    months = []
+    month = first_month
+    while month <= last_month:
+        months.append(month)
+        month = month_start(month, 1)
+
+    definitions = ',\n'.join([partition_definition(month) for month in months] +
+                             [f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)"])
+    logger.info(f"Partitioning {TABLE} into {len(months)} monthly partitions")
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} PARTITION BY RANGE COLUMNS(`timestamp`) (\n{definitions}\n)")
+
+
+def add_partitions(connection, months: List[date]):
+    """Split new monthly partitions off pmax; cheap as long as pmax is empty"""
+    if not months:
+        return
+    definitions = ', '.join([partition_definition(month) for month in months] +
+                            [f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)"])
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} REORGANIZE PARTITION {MAX_PARTITION} INTO ({definitions})")
+
+
+def archive_partition(connection, partition: Partition) -> str:
+    """
+    Move a partition's rows into a standalone ``measurements_archive_pYYYYMM`` table with EXCHANGE PARTITION,
+    which swaps table metadata instead of copying rows, and drop the then empty partition.
+    """
+    archive_table = f"{TABLE}_archive_{partition.name}"
+    with connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {archive_table} LIKE {TABLE}")
+        cursor.execute(f"ALTER TABLE {archive_table} REMOVE PARTITIONING")
+        cursor.execute(f"ALTER TABLE {TABLE} EXCHANGE PARTITION {partition.name} WITH TABLE {archive_table}")
+        cursor.execute(f"ALTER TABLE {TABLE} DROP PARTITION {partition.name}")
+    return archive_table
+
+
+def drop_partition(connection, partition: Partition):
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {TABLE} DROP PARTITION {partition.name}")
@@ -0,0 +1,167 @@
+"""
+Hourly and daily rollups of the ``measurements`` table.
+
+A rollup row pre-aggregates the measurements of one (UTC hour or day, technology, plmn_id, cell_id) group: the
+row count and, per metric, the count, sum, min and max of its non-null values. New measurements are merged into
+their rollups in the transaction that inserts them; deletes recompute the affected cell and day from the stored
+measurements with rebuild(), which is also what the ``rebuild_measurement_rollups`` command runs. Migration 0007
+backfills them from the measurements stored before it, with build().
+"""
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable, Dict, Iterable, List, Optional
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+from .models import Measurement, MeasurementDailyRollup, MeasurementHourlyRollup, MeasurementRollup
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_BATCH_SIZE = 500
+
+METRICS = (
+    'rsrp', 'rsrq', 'rscp', 'ec_no', 'rxlev', 'download_rate', 'upload_rate',
+    'ping_response_time', 'dns_response_time', 'web_response_time', 'sms_delivery_time',
+)
+DIMENSIONS = ('technology', 'plmn_id', 'cell_id')
+GRANULARITIES = {
+    'hour': (MeasurementHourlyRollup, TruncHour),
+    'day': (MeasurementDailyRollup, TruncDay),
+}
+VALUE_FIELDS = ('count', *[f"{metric}_{suffix}" for metric in METRICS for suffix in ('count', 'sum', 'min', 'max')])
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp)
+    timestamp = timestamp.astimezone(dt_timezone.utc)
+    if granularity == 'hour':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def is_bucket_start(timestamp: datetime, granularity: str) -> bool:
+    return bucket_start(timestamp, granularity) == timestamp
+
+
+def summarize(measurements: Iterable[Measurement], granularity: str) -> Dict[str, MeasurementRollup]:
+    """Unsaved rollups of the given measurements by rollup_key"""
+    model = GRANULARITIES[granularity][0]
+    rollups = {}
+    for measurement in measurements:
+        bucket = bucket_start(measurement.timestamp, granularity)
+        key = model.build_rollup_key(bucket, measurement.technology, measurement.plmn_id, measurement.cell_id)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = model(rollup_key=key, bucket=bucket, technology=measurement.technology,
+                                          plmn_id=measurement.plmn_id, cell_id=measurement.cell_id)
+        rollup.count += 1
+        for metric in METRICS:
+            value = getattr(measurement, metric)
+            if value is not None:
+                _add(rollup, metric, 1, value, value, value)
+    return rollups
+
+
+def add_measurements(measurements: List[Measurement]):
+    """Merge newly inserted measurements into their rollups; call it in the transaction that inserted them"""
+    for granularity, (model, _) in GRANULARITIES.items():
+        save_merged(model, summarize(measurements, granularity), _merge, VALUE_FIELDS, 'rollup_key')
+
+
+def rebuild(start: datetime, end: datetime, cell_ids: Optional[Iterable[Optional[int]]] = None) -> Dict[str, int]:
+    """
+    Recompute the rollups of every UTC day from start's through end's out of the stored measurements, only for
+    the given cells when cell_ids is passed. Returns the number of rollups written per granularity.
+    """
+    start = bucket_start(start, 'day')
+    end = bucket_start(end, 'day') + timedelta(days=1)
+    measurements = Measurement.objects.filter(timestamp__gte=start, timestamp__lt=end)
+    rollup_filter = Q(bucket__gte=start, bucket__lt=end)
+    if cell_ids is not None:
+        cell_ids = set(cell_ids)
+        cells = Q(cell_id__in=[cell_id for cell_id in cell_ids if cell_id is not None])
+        if None in cell_ids:
+            cells |= Q(cell_id__isnull=True)
+        measurements = measurements.filter(cells)
+        rollup_filter &= cells
+
+    written = {}
+    for granularity, (model, _) in GRANULARITIES.items():
+        model.objects.filter(rollup_filter).delete()
+        rollups = build(model, measurements, granularity)
+        model.objects.bulk_create(rollups, batch_size=ROLLUP_BATCH_SIZE)
+        written[granularity] = len(rollups)
+    logger.debug(f"Rebuilt rollups from {start} to {end}: {written}")
+    return written
+
+
+def build(model, measurements: models.QuerySet, granularity: str) -> List[MeasurementRollup]:
+    """
+    Unsaved model rollups of the given measurements at granularity, aggregated in the database. model and
+    measurements may be historical models, for migrations.
+    """
+    aggregations = {'count': Count('id')}
+    for metric in METRICS:
+        aggregations.update({
+            f"{metric}_count": Count(metric),
+            f"{metric}_sum": Sum(metric),
+            f"{metric}_min": Min(metric),
+            f"{metric}_max": Max(metric),
+        })
+    trunc = GRANULARITIES[granularity][1]
+    groups = (measurements.annotate(bucket=trunc('timestamp', tzinfo=dt_timezone.utc))
+              .values('bucket', *DIMENSIONS).annotate(**aggregations).order_by())
+    return [
+        model(rollup_key=MeasurementRollup.build_rollup_key(group['bucket'], *[group[field] for field in DIMENSIONS]),
+              **group)
+        for group in groups
+    ]
+
+
+def save_merged(model, rows: Dict[str, models.Model], merge: Callable, fields: Iterable[str], key_field: str):
+    """
+    Merge unsaved rows, by their unique key_field value, into the stored rows of the same key with merge(stored,
+    new) and insert the rest. Call it inside a transaction; the stored rows stay locked until it ends.
+    """
+    # lock the stored rows in key order, so concurrent ingests can't deadlock on them
+    stored = {
+        getattr(row, key_field): row
+        for row in model.objects.select_for_update().filter(**{f"{key_field}__in": sorted(rows)}).order_by(key_field)
+    }
+    for key, row in stored.items():
+        merge(row, rows[key])
+    if stored:
+        model.objects.bulk_update(list(stored.values()), fields, batch_size=ROLLUP_BATCH_SIZE)
+
+    new_rows = [row for key, row in rows.items() if key not in stored]
+    if not new_rows:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create(new_rows, batch_size=ROLLUP_BATCH_SIZE)
+    except IntegrityError:
+        # another ingest created some of these rows after they were read; merge into its rows instead
+        logger.debug(f"Concurrently created {model._meta.db_table} rows, merging again")
+        save_merged(model, {getattr(row, key_field): row for row in new_rows}, merge, fields, key_field)
+
+
+def _merge(target: MeasurementRollup, source: MeasurementRollup):
+    target.count += source.count
+    for metric in METRICS:
+        count = getattr(source, f"{metric}_count")
+        if count:
+            _add(target, metric, count, getattr(source, f"{metric}_sum"),
+                 getattr(source, f"{metric}_min"), getattr(source, f"{metric}_max"))
+
+
+def _add(rollup: MeasurementRollup, metric: str, count: int, total: float, low: float, high: float):
+    if getattr(rollup, f"{metric}_count"):
+        total += getattr(rollup, f"{metric}_sum")
+        low = min(low, getattr(rollup, f"{metric}_min"))
+        high = max(high, getattr(rollup, f"{metric}_max"))
+    setattr(rollup, f"{metric}_count", getattr(rollup, f"{metric}_count") + count)
+    setattr(rollup, f"{metric}_sum", total)
+    setattr(rollup, f"{metric}_min", low)
+    setattr(rollup, f"{metric}_max", high)
@@ -1,45 +1,115 @@
+import base64
+import hashlib
+import json
 import logging
-from typing import List, Dict
-from django.db import transaction
-from .models import Measurement
-from . import interfaces
+import math
+import time
+from itertools import islice
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from typing import Any, BinaryIO, Callable, List, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+from pydantic import TypeAdapter, ValidationError
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Avg, Count, ExpressionWrapper, FloatField, Max, Min, Q, Sum
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth, TruncWeek
+from django.utils import timezone
+from .models import CellSummary, Measurement, IngestionBatch, IngestionJob
+from libs.dataclasses import UUIDField
+from utils.cache.interfaces import AbstractCache
+from . import arrow_export, cells, codecs, filters, geo, interfaces, rollups, validators
+from .write_behind import BufferFull, WriteBehindBuffer
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BULK_BATCH_SIZE = 1000
+NDJSON_MAX_LINE_BYTES = 64 * 1024
+NDJSON_MAX_REPORTED_ERRORS = 1000
+INGESTION_JOB_LEASE = timedelta(minutes=10)
+INGESTION_JOB_MAX_ATTEMPTS = 3
+WRITE_BEHIND_DURABLE_ACK_TIMEOUT = 30  # seconds
+EXPORT_CHUNK_SIZE = 5000
+COLUMNAR_EXPORT_CHUNK_SIZE = 50000  # rows per Parquet row group / Arrow record batch
+HEATMAP_TILE_BINS = 32  # per tile side, 8 px bins on 256 px tiles
+DEFAULT_HEATMAP_CACHE_SECONDS = 300
+DEFAULT_CACHE_SECONDS = 60
+CACHE_NAMESPACE = 'measurements'
+CACHE_SCOPE_MAX_DAYS = 31  # reads over more days of data are invalidated by every write
+CLUSTER_CELL_PIXELS = 64  # smallest cluster grid cell, in screen pixels
+
+BATCH_ID_ADAPTER = TypeAdapter(Optional[UUIDField])
+
+MEASUREMENT_FIELDS = (
+    'timestamp', 'latitude', 'longitude', 'technology', 'plmn_id', 'lac', 'rac', 'tac', 'cell_id',
+    'frequency_band', 'arfcn', 'rsrp', 'rsrq', 'rscp', 'ec_no', 'rxlev', 'download_rate', 'upload_rate',
+    'ping_response_time', 'dns_response_time', 'web_response_time', 'sms_delivery_time',
+)
+
+
+
+MEASUREMENT_DTO_FIELDS = tuple(interfaces.MeasurementDTO.model_fields)
+
+AGGREGATE_FUNCTIONS = {'avg': Avg, 'min': Min, 'max': Max}
+BUCKET_FUNCTIONS = {'hour': TruncHour, 'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+
+
+class ListPage(NamedTuple):
+    count: Optional[int]
+    count_type: interfaces.CountMode
+    fields: List[str]
+    rows: List[tuple]  # values of fields (followed by any extra cursor columns) per row
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+class BulkInsertResult(NamedTuple):
+    created: List[Measurement]
+    skipped_count: int
+    duplicate_count: int
+    batches: List[interfaces.BulkInsertBatchReport]
+
 
 class MeasurementService(interfaces.AbstractMeasurementService):
-    def __init__(self):
-        pass
+    def __init__(self, bulk_batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+                 write_behind_buffer: Optional[WriteBehindBuffer] = None,
+                 cache: Optional[AbstractCache] = None,
+                 cache_seconds: int = DEFAULT_CACHE_SECONDS,
+                 heatmap_cache_seconds: int = DEFAULT_HEATMAP_CACHE_SECONDS):
+        if bulk_batch_size < 1:
+            raise ValueError("bulk_batch_size should be greater than 0")
+        self._bulk_batch_size = bulk_batch_size
+        # read-through cache of list, aggregate and map responses, invalidated by every write; None disables it
+        self._cache = cache
+        self._cache_seconds = cache_seconds
+        self._heatmap_cache_seconds = heatmap_cache_seconds
+        self._write_behind_buffer = write_behind_buffer
+        if write_behind_buffer is not None:
+            write_behind_buffer.start(self._flush_write_behind)
 
     def create_measurement(self, request: interfaces.CreateMeasurementReq) -> interfaces.MeasurementDTO:
         logger.info(f"Creating measurement: {request}")
         
+        validation = validators.validate_rows([request.model_dump()])
+        if validation.errors:
+            logger.debug(f"Rejected measurement: {validation.errors[0]}")
+            raise interfaces.InvalidMeasurement('; '.join(validation.errors[0]))
+
         try:
-            measurement = Measurement.objects.create(
-                timestamp=request.timestamp,
-                latitude=request.latitude,
-                longitude=request.longitude,
-                technology=request.technology,
-                plmn_id=request.plmn_id,
-                lac=request.lac,
-                rac=request.rac,
-                tac=request.tac,
-                cell_id=request.cell_id,
-                frequency_band=request.frequency_band,
-                arfcn=request.arfcn,
-                rsrp=request.rsrp,
-                rsrq=request.rsrq,
-                rscp=request.rscp,
-                ec_no=request.ec_no,
-                rxlev=request.rxlev,
-                download_rate=request.download_rate,
-                upload_rate=request.upload_rate,
-                ping_response_time=request.ping_response_time,
-                dns_response_time=request.dns_response_time,
-                web_response_time=request.web_response_time,
-                sms_delivery_time=request.sms_delivery_time
-            )
-            
+            measurement = self._build_measurement(validation.rows[0])
+            if measurement is None:
+                raise ValueError("latitude and longitude are required")
+
+            try:
+                with transaction.atomic():
+                    measurement.save()
+                    rollups.add_measurements([measurement])
+                    cells.add_measurements([measurement])
+                    self._invalidate_cache([measurement])
+            except IntegrityError:
+                # the same reading was already stored, e.g. by a retried request
+                measurement = Measurement.objects.get(dedup_key=measurement.dedup_key, timestamp=measurement.timestamp)
+                logger.info(f"Measurement already exists with ID: {measurement.id}")
+
             result = self._convert_measurement_to_dataclass(measurement)
             logger.info(f"Created measurement with ID: {result.id}")
             return result
@@ -48,8 +118,56 @@ class MeasurementService(interfaces.AbstractMeasurementService):
             logger.error(f"Error creating measurement: {e}")
             raise interfaces.BadRequestRoot()
 
-    def get_measurement(self, measurement_id: int) -> interfaces.MeasurementDTO:
+    def enqueue_measurement(self, request: interfaces.CreateMeasurementReq, durable: bool = True) -> Optional[interfaces.MeasurementDTO]:
+        if self._write_behind_buffer is None:
+            return self.create_measurement(request)
+
+        validation = validators.validate_rows([request.model_dump()])
+        if validation.errors:
+            logger.debug(f"Rejected measurement: {validation.errors[0]}")
+            raise interfaces.InvalidMeasurement('; '.join(validation.errors[0]))
+        row = validation.rows[0]
+        if row.get('latitude') is None or row.get('longitude') is None:
+            raise interfaces.InvalidMeasurement("latitude and longitude are required")
+
+        try:
+            future = self._write_behind_buffer.enqueue(row)
+        except BufferFull as e:
+            logger.warning(f"Rejected measurement: {e}")
+            raise interfaces.WriteBehindBufferFull(str(e))
+
+        if not durable:
+            logger.debug("Buffered measurement for write-behind")
+            return None
+
+        try:
+            measurement = future.result(timeout=WRITE_BEHIND_DURABLE_ACK_TIMEOUT)
+        except FutureTimeoutError:
+            logger.error("Timed out waiting for write-behind flush")
+            raise interfaces.WriteBehindTimeout()
+        except Exception as e:
+            logger.error(f"Error creating buffered measurement: {e}")
+            raise interfaces.BadRequestRoot()
+
+        if measurement is None or measurement.id is None:
+            # the same reading was already stored, or the flush couldn't tell its primary key
+            measurement = Measurement.objects.get(dedup_key=Measurement.build_dedup_key(
+                row['timestamp'], row['latitude'], row['longitude'], row.get('cell_id')
+            ), timestamp=row['timestamp'])
+        result = self._convert_measurement_to_dataclass(measurement)
+        logger.info(f"Created buffered measurement with ID: {result.id}")
+        return result
+
+    def get_measurement(self, measurement_id: int, fields: Optional[List[str]] = None) -> interfaces.MeasurementDTO:
         logger.info(f"Getting measurement with ID: {measurement_id}")
+
+        if fields:
+            fields = self._check_fields(fields)
+            row = Measurement.objects.filter(id=measurement_id).values(*fields).first()
+            if row is None:
+                logger.debug(f"Measurement with ID {measurement_id} doesn't exist")
+                raise interfaces.MeasurementNotFound()
+            return interfaces.MeasurementDTO.model_construct(**row)
         
         try:
             measurement = Measurement.objects.get(id=measurement_id)
@@ -60,9 +178,215 @@ class MeasurementService(interfaces.AbstractMeasurementService):
             logger.debug(f"Measurement with ID {measurement_id} doesn't exist")
             raise interfaces.MeasurementNotFound()
 
+    def get_measurement_json(self, measurement_id: int, fields: Optional[List[str]] = None) -> bytes:
+        logger.info(f"Getting measurement with ID: {measurement_id} as JSON")
+        fields = self._check_fields(fields) if fields else list(MEASUREMENT_DTO_FIELDS)
+        row = Measurement.objects.filter(id=measurement_id).values_list(*fields).first()
+        if row is None:
+            logger.debug(f"Measurement with ID {measurement_id} doesn't exist")
+            raise interfaces.MeasurementNotFound()
+        return codecs.encode_json(dict(zip(fields, row)))
+
     def list_measurements(self, request: interfaces.MeasurementListReq) -> interfaces.MeasurementListResponse:
         logger.info(f"Listing measurements with filters: {request}")
+        page = self._list_page(request)
+
+        # Convert to DTOs; projected rows become partial DTOs that only dump the selected fields
+        if request.fields:
+            results = [interfaces.MeasurementDTO.model_construct(**dict(zip(page.fields, row))) for row in page.rows]
+        else:
+            results = [interfaces.MeasurementDTO(**dict(zip(page.fields, row))) for row in page.rows]
+
+        response = interfaces.MeasurementListResponse(
+            count=page.count,
+            count_type=page.count_type,
+            results=results,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
         
+        logger.info(f"Retrieved {len(results)} measurements out of {page.count} total ({page.count_type})")
+        return response
+
+    def list_measurements_json(self, request: interfaces.MeasurementListReq) -> bytes:
+        logger.info(f"Listing measurements as JSON with filters: {request}")
+        page = self._list_page(request)
+        float_indexes = [index for index, field in enumerate(page.fields) if field in codecs.FLOAT_COLUMNS]
+        content = codecs.encode_json({
+            'count': page.count,
+            'count_type': page.count_type,
+            'results': [dict(zip(page.fields, row)) for row in page.rows],
+            'next_cursor': page.next_cursor,
+            'prev_cursor': page.prev_cursor,
+        }, floats=(row[index] for row in page.rows for index in float_indexes))
+        logger.info(f"Retrieved {len(page.rows)} measurements out of {page.count} total ({page.count_type})")
+        return content
+
+    def export_measurements(self, request: interfaces.MeasurementListReq,
+                            output: interfaces.ExportFormat) -> Iterator[bytes]:
+        logger.info(f"Exporting measurements as {output} with filters: {request}")
+        filters.check_indexed(request, chunked=True)
+        fields = self._check_fields(request.fields) if request.fields else list(MEASUREMENT_DTO_FIELDS)
+        if output in ('parquet', 'arrow'):
+            chunks = self._iter_row_chunks(request, fields, COLUMNAR_EXPORT_CHUNK_SIZE)
+            return arrow_export.encode(fields, chunks, output)
+
+        encode = codecs.encode_csv if output == 'csv' else codecs.encode_ndjson
+        chunks = self._iter_row_chunks(request, fields, EXPORT_CHUNK_SIZE)
+
+        def stream():
+            exported_count = 0
+            if output == 'csv':
+                yield codecs.encode_csv_header(fields)
+            for rows in chunks:
+                exported_count += len(rows)
+                yield encode(fields, rows)
+            logger.info(f"Exported {exported_count} measurements as {output}")
+
+        return stream()
+
+    def aggregate_measurements(self, request: interfaces.MeasurementAggregateReq) -> interfaces.MeasurementAggregateResponse:
+        logger.info(f"Aggregating measurements: {request}")
+        if request.metrics and not request.aggregates:
+            raise interfaces.InvalidAggregation("aggregates should not be empty when metrics are requested")
+        # the rollups answer any aggregation they can without a filter; the measurements would be read whole
+        filters.check_indexed(request, bounded=self._rollup_granularity(request) is None)
+        return self._read_through('aggregate', request, lambda: self._aggregate(request), self._cache_seconds,
+                                  self._cache_scopes(request))
+
+    def _aggregate(self, request: interfaces.MeasurementAggregateReq) -> interfaces.MeasurementAggregateResponse:
+        dimensions = list(dict.fromkeys(request.group_by))
+        metrics = list(dict.fromkeys(request.metrics))
+        aggregates = list(dict.fromkeys(request.aggregates))
+        granularity = self._rollup_granularity(request)
+        if granularity:
+            # answered exactly by the pre-aggregated groups, which are far fewer than the measurements
+            logger.debug(f"Aggregating measurements from {granularity} rollups")
+            queryset = self._filter_rollups(request, rollups.GRANULARITIES[granularity][0])
+            time_field = 'bucket'
+            annotations = {'count': Coalesce(Sum('count'), 0)}
+            for metric in metrics:
+                for aggregate in aggregates:
+                    annotations[f"{metric}_{aggregate}"] = self._rollup_aggregation(metric, aggregate)
+        else:
+            queryset = self._filter_measurements(request)
+            time_field = 'timestamp'
+            annotations = {'count': Count('id')}
+            for metric in metrics:
+                for aggregate in aggregates:
+                    annotations[f"{metric}_{aggregate}"] = AGGREGATE_FUNCTIONS[aggregate](metric)
+
+        if request.bucket:
+            # truncate in UTC so buckets don't depend on TIME_ZONE (and MySQL needs no time zone tables);
+            # annotated as `period` because the rollups already have a `bucket` field
+            queryset = queryset.annotate(period=BUCKET_FUNCTIONS[request.bucket](time_field, tzinfo=dt_timezone.utc))
+            dimensions.insert(0, 'period')
+
+        # GROUP BY the dimensions; without any the whole filtered set is one group
+        if dimensions:
+            queryset = queryset.values(*dimensions).annotate(**annotations).order_by(*dimensions)
+            groups = [
+                {('bucket' if key == 'period' else key): value for key, value in group.items()}
+                for group in queryset[:request.limit + 1]
+            ]
+        else:
+            groups = [queryset.aggregate(**annotations)]
+
+        truncated = len(groups) > request.limit
+        groups = groups[:request.limit]
+        logger.info(f"Aggregated measurements into {len(groups)} groups")
+        return interfaces.MeasurementAggregateResponse(groups=groups, truncated=truncated)
+
+    def list_cell_summaries(self, request: interfaces.CellSummaryReq) -> interfaces.CellSummaryListResponse:
+        logger.info(f"Listing cell summaries: {request}")
+        queryset = CellSummary.objects.filter(**self._cell_filters(request)).order_by('plmn_id', 'cell_id', 'id')
+        summaries = list(queryset[:request.limit + 1])
+        results = [self._convert_cell_summary_to_dataclass(summary) for summary in summaries[:request.limit]]
+        logger.info(f"Found {len(results)} cell summaries")
+        return interfaces.CellSummaryListResponse(results=results, truncated=len(summaries) > request.limit)
+
+    def get_heatmap_tile(self, request: interfaces.HeatmapTileReq) -> interfaces.HeatmapTileResponse:
+        # the tile's bounding box is always indexed, so this only checks the lookups themselves
+        filters.check_indexed(self._heatmap_tile_filter(request))
+        # tiles only expire: under continuous ingest every write would otherwise drop them
+        return self._read_through('heatmap', request, lambda: self._build_heatmap_tile(request),
+                                  self._heatmap_cache_seconds, scopes=())
+
+    def _build_heatmap_tile(self, request: interfaces.HeatmapTileReq) -> interfaces.HeatmapTileResponse:
+        logger.info(f"Building heatmap tile: {request}")
+        queryset = self._filter_measurements(self._heatmap_tile_filter(request))
+        column, row = geo.tile_bin_expressions(request.zoom, request.x, request.y, HEATMAP_TILE_BINS)
+        groups = queryset.annotate(bin_x=column, bin_y=row).values('bin_x', 'bin_y').annotate(
+            count=Count('id'), rsrp_avg=Avg('rsrp'), download_rate_avg=Avg('download_rate')
+        ).order_by()
+
+        cells = [
+            interfaces.HeatmapCell(
+                x=int(group['bin_x']),
+                y=int(group['bin_y']),
+                count=group['count'],
+                rsrp_avg=None if group['rsrp_avg'] is None else round(group['rsrp_avg'], 1),
+                download_rate_avg=None if group['download_rate_avg'] is None else round(group['download_rate_avg'], 2),
+            )
+            for group in groups
+            # rows on the east/south edge are binned by the neighbouring tile
+            if 0 <= group['bin_x'] < HEATMAP_TILE_BINS and 0 <= group['bin_y'] < HEATMAP_TILE_BINS
+        ]
+        tile = interfaces.HeatmapTileResponse(
+            zoom=request.zoom, x=request.x, y=request.y, bins=HEATMAP_TILE_BINS, cells=cells
+        )
+        logger.info(f"Built heatmap tile {request.zoom}/{request.x}/{request.y} with {len(cells)} cells")
+        return tile
+
+    def cluster_measurements(self, request: interfaces.MeasurementClusterReq) -> interfaces.MeasurementClusterResponse:
+        filters.check_indexed(request)
+        # like heatmap tiles, clusters only expire
+        return self._read_through('clusters', request, lambda: self._cluster(request), self._cache_seconds,
+                                  scopes=())
+
+    def _cluster(self, request: interfaces.MeasurementClusterReq) -> interfaces.MeasurementClusterResponse:
+        logger.info(f"Clustering measurements: {request}")
+        cell_pixels = self._cluster_cell_pixels(request)
+        column, row = geo.world_bin_expressions(geo.TILE_SIZE * 2 ** request.zoom / cell_pixels)
+        queryset = self._filter_measurements(interfaces.MeasurementListReq(
+            technology=request.technology,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            bbox=request.bbox,
+            **filters.lookups(request),
+        ))
+        # the grid can't have more than max_clusters cells over the bbox, the slice is only a safety net
+        groups = queryset.annotate(bin_x=column, bin_y=row).values('bin_x', 'bin_y').annotate(
+            count=Count('id'),
+            centroid_latitude=Avg('latitude'),
+            centroid_longitude=Avg('longitude'),
+            first_id=Min('id'),
+            rsrp_avg=Avg('rsrp'),
+            rsrp_min=Min('rsrp'),
+            rsrp_max=Max('rsrp'),
+            download_rate_avg=Avg('download_rate'),
+        ).order_by('-count')[:request.max_clusters]
+
+        clusters = [
+            interfaces.MeasurementCluster(
+                latitude=group['centroid_latitude'],
+                longitude=group['centroid_longitude'],
+                count=group['count'],
+                id=group['first_id'] if group['count'] == 1 else None,
+                rsrp_avg=group['rsrp_avg'],
+                rsrp_min=group['rsrp_min'],
+                rsrp_max=group['rsrp_max'],
+                download_rate_avg=group['download_rate_avg'],
+            )
+            for group in groups
+        ]
+        count = sum(cluster.count for cluster in clusters)
+        logger.info(f"Clustered {count} measurements into {len(clusters)} clusters on a {cell_pixels} px grid")
+        return interfaces.MeasurementClusterResponse(
+            zoom=request.zoom, cell_pixels=cell_pixels, count=count, clusters=clusters
+        )
+
+    def _filter_measurements(self, request: interfaces.MeasurementListReq | interfaces.MeasurementAggregateReq):
         queryset = Measurement.objects.all()
         
         # Apply filters
@@ -74,81 +398,464 @@ class MeasurementService(interfaces.AbstractMeasurementService):
         
         if request.end_date:
             queryset = queryset.filter(timestamp__lte=request.end_date)
+
+        queryset = queryset.filter(**self._cell_filters(request))
+        queryset = queryset.filter(**filters.lookups(request))
+
+        # location filters narrow the rows down to grid cell ranges first, see geo.py
+        if request.bbox:
+            queryset = queryset.filter(geo.bounding_box_filter(
+                request.bbox.min_longitude, request.bbox.min_latitude, request.bbox.max_longitude, request.bbox.max_latitude
+            ))
+
+        if request.radius:
+            queryset = queryset.filter(geo.bounding_box_filter(
+                *geo.radius_bounding_box(request.radius.latitude, request.radius.longitude, request.radius.meters)
+            )).alias(
+                distance=geo.distance_expression(request.radius.latitude, request.radius.longitude)
+            ).filter(distance__lte=request.radius.meters)
+
+        if request.bbox or request.radius:
+            queryset = geo.use_grid_index(queryset)
+
+        return queryset
+
+    def _read_through(self, kind: str, request, compute: Callable[[], Any], timeout: int,
+                      scopes: Optional[List[str]] = None) -> Any:
+        """
+        compute() served from the cache, keyed on the normalized (validated, defaults filled in, lists sorted)
+        request and invalidated by writes to the given scopes, see _cache_scopes()
+        """
+        if self._cache is None:
+            return compute()
+        # the order of the selected fields and of the IN-lists doesn't change what is read
+        lists = {name: value for name, value in filters.lookups(request).items() if name.endswith('__in')}
+        if getattr(request, 'fields', None):
+            lists['fields'] = request.fields
+        normalized = request.model_copy(update={name: sorted(set(value)) for name, value in lists.items()})
+        key = f"{kind}:{hashlib.sha1(normalized.model_dump_json().encode()).hexdigest()}"
+        return self._cache.get_or_set(CACHE_NAMESPACE, key, compute, timeout, scopes)
+
+    def _invalidate_cache(self, measurements: Iterable[Measurement]):
+        """
+        Stop serving cached responses that the written measurements can change once the current transaction
+        commits, so no reader caches the old rows
+        """
+        if self._cache is not None:
+            scopes = {self._cache_day(measurement.timestamp).isoformat() for measurement in measurements}
+            transaction.on_commit(lambda: self._cache.invalidate(CACHE_NAMESPACE, scopes))
+
+    @staticmethod
+    def _cache_scopes(request) -> Optional[List[str]]:
+        """
+        The UTC days of data a request reads, so writes to other days keep its cached response; None when it
+        has no date range or one of more than CACHE_SCOPE_MAX_DAYS, which every write invalidates
+        """
+        if request.start_date is None or request.end_date is None:
+            return None
+        # a day more on either side covers naive dates, which are in TIME_ZONE rather than UTC
+        first = MeasurementService._cache_day(request.start_date) - timedelta(days=1)
+        last = MeasurementService._cache_day(request.end_date) + timedelta(days=1)
+        if (last - first).days >= CACHE_SCOPE_MAX_DAYS:
+            return None
+        return [(first + timedelta(days=day)).isoformat() for day in range((last - first).days + 1)]
+
+    @staticmethod
+    def _cache_day(value: datetime) -> date:
+        return value.astimezone(dt_timezone.utc).date() if timezone.is_aware(value) else value.date()
+
+    @staticmethod
+    def _heatmap_tile_filter(request: interfaces.HeatmapTileReq) -> interfaces.MeasurementListReq:
+        return interfaces.MeasurementListReq(
+            technology=request.technology,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            bbox=interfaces.BoundingBox(**dict(zip(
+                ('min_longitude', 'min_latitude', 'max_longitude', 'max_latitude'),
+                geo.tile_bounding_box(request.zoom, request.x, request.y)
+            ))),
+            **filters.lookups(request),
+        )
+
+    @staticmethod
+    def _cluster_cell_pixels(request: interfaces.MeasurementClusterReq) -> int:
+        """Smallest grid cell size, doubling from CLUSTER_CELL_PIXELS, that covers the bbox in max_clusters cells"""
+        world_pixels = geo.TILE_SIZE * 2 ** request.zoom
+        width = (geo.world_x(request.bbox.max_longitude) - geo.world_x(request.bbox.min_longitude)) * world_pixels
+        height = (geo.world_y(request.bbox.min_latitude) - geo.world_y(request.bbox.max_latitude)) * world_pixels
+        cell_pixels = CLUSTER_CELL_PIXELS
+        # a span touches at most one more cell than it is long, depending on where it starts
+        while (math.ceil(width / cell_pixels) + 1) * (math.ceil(height / cell_pixels) + 1) > request.max_clusters:
+            cell_pixels *= 2
+        return cell_pixels
+
+    @staticmethod
+    def _filter_rollups(request: interfaces.MeasurementAggregateReq, model):
+        queryset = model.objects.all()
+        if request.technology:
+            queryset = queryset.filter(technology=request.technology)
+        if request.start_date:
+            queryset = queryset.filter(bucket__gte=request.start_date)
+        if request.end_date:
+            queryset = queryset.filter(bucket__lte=request.end_date)
+        queryset = queryset.filter(**MeasurementService._cell_filters(request))
+        return queryset.filter(**filters.lookups(request))
+
+    @staticmethod
+    def _cell_filters(request) -> Dict:
+        return {field: getattr(request, field) for field in cells.IDENTITY_FIELDS if getattr(request, field) is not None}
+
+    @staticmethod
+    def _rollup_aggregation(metric: str, aggregate: str):
+        if aggregate == 'avg':
+            return ExpressionWrapper(
+                Sum(f"{metric}_sum") / NullIf(Sum(f"{metric}_count"), 0), output_field=FloatField()
+            )
+        return AGGREGATE_FUNCTIONS[aggregate](f"{metric}_{aggregate}")
+
+    @staticmethod
+    def _rollup_granularity(request: interfaces.MeasurementAggregateReq) -> Optional[str]:
+        """Coarsest rollup that answers the aggregation exactly, None when the measurements have to be read"""
+        if request.bbox or request.radius or not set(request.group_by) <= set(rollups.DIMENSIONS):
+            return None
+        # rollups are grouped by plmn_id and cell_id only
+        if request.lac is not None or request.tac is not None:
+            return None
+        # and hold no single metric values or frequency bands to filter on
+        if any(name not in filters.ROLLUP_LOOKUPS for name in filters.lookups(request)):
+            return None
+        for granularity in ('hour',) if request.bucket == 'hour' else ('day', 'hour'):
+            # end_date is inclusive, so it has to be the last instant of a bucket
+            if (request.start_date is None or rollups.is_bucket_start(request.start_date, granularity)) and \
+                    (request.end_date is None or
+                     rollups.is_bucket_start(request.end_date + timedelta(microseconds=1), granularity)):
+                return granularity
+        return None
+
+    def _iter_row_chunks(self, request: interfaces.MeasurementListReq, fields: List[str],
+                         chunk_size: int) -> Iterator[List[tuple]]:
+        """
+        Yield the filtered rows oldest first as lists of at most chunk_size tuples of fields. Every chunk is
+        its own short indexed query that seeks past the previous chunk on (timestamp, id), so neither the
+        database nor this process ever holds more than one chunk, whatever the size of the result.
+        """
+        columns = list(dict.fromkeys([*fields, 'timestamp', 'id']))
+        timestamp_index, id_index = columns.index('timestamp'), columns.index('id')
+        queryset = self._filter_measurements(request).values_list(*columns).order_by('timestamp', 'id')
+
+        chunk = list(queryset[:chunk_size])
+        while chunk:
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            timestamp, measurement_id = chunk[-1][timestamp_index], chunk[-1][id_index]
+            chunk = list(queryset.filter(
+                Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=measurement_id)
+            )[:chunk_size])
+
+    def _list_page(self, request: interfaces.MeasurementListReq) -> ListPage:
+        """Count and fetch one page of rows as tuples of the requested fields"""
+        filters.check_indexed(request)
+        return self._read_through('list', request, lambda: self._fetch_list_page(request), self._cache_seconds,
+                                  self._cache_scopes(request))
+
+    def _fetch_list_page(self, request: interfaces.MeasurementListReq) -> ListPage:
+        queryset = self._filter_measurements(request)
         
         # Get total count
-        total_count = queryset.count()
-        
-        # Apply pagination
-        measurements = queryset[request.offset:request.offset + request.limit]
+        count_type = request.count
+        total_count = None
+        if count_type == 'estimated':
+            total_count = self._estimate_count(queryset)
+            if total_count is None:
+                count_type = 'exact'
+        if count_type == 'exact':
+            total_count = queryset.count()
         
-        # Convert to DTOs
-        results = [self._convert_measurement_to_dataclass(m) for m in measurements]
-        
-        response = interfaces.MeasurementListResponse(
+        # Select only the requested columns, plus the ones the cursors are made of
+        fields = self._check_fields(request.fields) if request.fields else list(MEASUREMENT_DTO_FIELDS)
+        columns = list(dict.fromkeys([*fields, 'timestamp', 'id']))
+        timestamp_index, id_index = columns.index('timestamp'), columns.index('id')
+        queryset = queryset.values_list(*columns)
+
+        # Apply pagination, seeking on (timestamp, id) when a cursor is given; a prev cursor seeks
+        # backwards in the reverse order. Fetch one extra row to know whether there is another page.
+        descending = request.order_by.startswith('-')
+        if request.cursor:
+            direction, timestamp, measurement_id = self._decode_cursor(request.cursor)
+            if (direction == 'next') == descending:
+                queryset = queryset.filter(
+                    Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=measurement_id)
+                ).order_by('-timestamp', '-id')
+            else:
+                queryset = queryset.filter(
+                    Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=measurement_id)
+                ).order_by('timestamp', 'id')
+            rows = list(queryset[:request.limit + 1])
+        else:
+            direction = 'next'
+            order = ('-timestamp', '-id') if descending else ('timestamp', 'id')
+            rows = list(queryset.order_by(*order)[request.offset:request.offset + request.limit + 1])
+
+        has_more = len(rows) > request.limit
+        rows = rows[:request.limit]
+        if direction == 'prev':
+            rows.reverse()
+        has_next = has_more if direction == 'next' else True
+        has_prev = has_more if direction == 'prev' else bool(request.cursor or request.offset)
+
+        def cursor(direction: str, row: tuple) -> str:
+            return self._encode_cursor(direction, row[timestamp_index], row[id_index])
+
+        return ListPage(
             count=total_count,
-            results=results
+            count_type=count_type,
+            fields=fields,
+            rows=rows,
+            next_cursor=cursor('next', rows[-1]) if rows and has_next else None,
+            prev_cursor=cursor('prev', rows[0]) if rows and has_prev else None,
         )
-        
-        logger.info(f"Retrieved {len(results)} measurements out of {total_count} total")
-        return response
 
-    def bulk_create_measurements(self, request: interfaces.BulkCreateMeasurementReq) -> interfaces.BulkCreateMeasurementResponse:
-        logger.info(f"Bulk creating {len(request.measurements)} measurements")
-        
+    def bulk_create_measurements(self, request: interfaces.BulkCreateMeasurementReq,
+                                 response_mode: interfaces.BulkResponseMode = 'summary') -> interfaces.BulkCreateMeasurementResponse:
+        logger.info(f"Bulk creating {len(request.measurements)} measurements (batch_id={request.batch_id})")
+        return self._bulk_create_rows(
+            validators.validate_rows(request.measurements),
+            batch_id=request.batch_id,
+            response_mode=response_mode
+        )
+
+    def bulk_create_measurements_columnar(self, batch: interfaces.ColumnarMeasurementBatch,
+                                          response_mode: interfaces.BulkResponseMode = 'summary') -> interfaces.BulkCreateMeasurementResponse:
+        logger.info(f"Bulk creating {batch.count} columnar measurements (batch_id={batch.batch_id})")
+        return self._bulk_create_rows(
+            codecs.decode_columnar_rows(batch), batch_id=batch.batch_id, response_mode=response_mode
+        )
+
+    def _bulk_create_rows(self, validation: validators.BatchValidationResult, batch_id: Optional[str],
+                          response_mode: interfaces.BulkResponseMode) -> interfaces.BulkCreateMeasurementResponse:
+        if self._is_batch_ingested(batch_id):
+            logger.info(f"Batch {batch_id} was already ingested, skipping")
+            return interfaces.BulkCreateMeasurementResponse(
+                created_count=0, duplicate_batch=True, results=[] if response_mode == 'full' else None
+            )
+
         try:
-            with transaction.atomic():
-                created_measurements = []
-                
-                for measurement_data in request.measurements:
-                    if measurement_data.latitude is None or measurement_data.longitude is None:
-                        continue
-                    
-                    measurement = Measurement.objects.create(
-                        timestamp=measurement_data.timestamp,
-                        latitude=measurement_data.latitude,
-                        longitude=measurement_data.longitude,
-                        technology=measurement_data.technology,
-                        plmn_id=measurement_data.plmn_id,
-                        lac=measurement_data.lac,
-                        rac=measurement_data.rac,
-                        tac=measurement_data.tac,
-                        cell_id=measurement_data.cell_id,
-                        frequency_band=measurement_data.frequency_band,
-                        arfcn=measurement_data.arfcn,
-                        rsrp=measurement_data.rsrp,
-                        rsrq=measurement_data.rsrq,
-                        rscp=measurement_data.rscp,
-                        ec_no=measurement_data.ec_no,
-                        rxlev=measurement_data.rxlev,
-                        download_rate=measurement_data.download_rate,
-                        upload_rate=measurement_data.upload_rate,
-                        ping_response_time=measurement_data.ping_response_time,
-                        dns_response_time=measurement_data.dns_response_time,
-                        web_response_time=measurement_data.web_response_time,
-                        sms_delivery_time=measurement_data.sms_delivery_time
-                    )
-                    created_measurements.append(measurement)
-                
-                results = [self._convert_measurement_to_dataclass(m) for m in created_measurements]
-                
-                response = interfaces.BulkCreateMeasurementResponse(
-                    created_count=len(results),
-                    results=results
-                )
-                
-                logger.info(f"Successfully created {len(results)} measurements")
-                return response
-                
+            result = self._bulk_insert(validation.rows)
         except Exception as e:
             logger.error(f"Error in bulk create: {e}")
             raise interfaces.BulkCreateError()
 
+        self._record_batch(batch_id, len(result.created))
+
+        ids = [m.id for m in result.created if m.id is not None]
+        response = interfaces.BulkCreateMeasurementResponse(
+            created_count=len(result.created),
+            skipped_count=result.skipped_count,
+            duplicate_count=result.duplicate_count,
+            invalid_count=len(validation.errors),
+            errors=self._report_errors(validation.errors),
+            first_id=min(ids) if ids else None,
+            last_id=max(ids) if ids else None,
+            ids=ids if response_mode == 'ids' and len(ids) == len(result.created) else None,
+            results=[self._convert_measurement_to_dataclass(m) for m in result.created] if response_mode == 'full' else None,
+            batches=result.batches
+        )
+
+        logger.info(f"Successfully created {response.created_count} measurements in {len(result.batches)} batches, "
+                    f"skipped {result.skipped_count}, ignored {result.duplicate_count} duplicates, "
+                    f"rejected {len(validation.errors)} invalid rows")
+        return response
+
+    def ingest_measurements_stream(self, stream: BinaryIO, batch_id: Optional[str] = None) -> interfaces.StreamIngestResponse:
+        logger.info(f"Ingesting NDJSON measurement stream (batch_id={batch_id})")
+        try:
+            batch_id = BATCH_ID_ADAPTER.validate_python(batch_id)
+        except ValidationError:
+            logger.debug(f"Rejected NDJSON stream with invalid batch_id: {batch_id}")
+            raise interfaces.InvalidIngestionPayload("batch_id should be 4-64 characters of [a-zA-Z0-9_.-]")
+
+        received_count = created_count = skipped_count = duplicate_count = error_count = batch_count = 0
+        errors = []
+        chunk = []
+
+        def report(line_number: int, line_errors: List[str]):
+            nonlocal error_count
+            error_count += 1
+            if len(errors) < NDJSON_MAX_REPORTED_ERRORS:
+                errors.append(interfaces.IngestLineError(line=line_number, errors=line_errors))
+
+        def flush():
+            nonlocal created_count, skipped_count, duplicate_count, batch_count
+            validation = validators.validate_rows([row for _, row in chunk])
+            for index, row_errors in validation.errors.items():
+                report(chunk[index][0], row_errors)
+            try:
+                result = self._bulk_insert(validation.rows)
+            except Exception as e:
+                logger.error(f"Error inserting NDJSON chunk of {len(chunk)} rows: {e}")
+                for (line_number, _), rejected in zip(chunk, validation.error_mask):
+                    if not rejected:
+                        report(line_number, ["database error while inserting row"])
+            else:
+                created_count += len(result.created)
+                skipped_count += result.skipped_count
+                duplicate_count += result.duplicate_count
+                batch_count += len(result.batches)
+            chunk.clear()
+
+        if self._is_batch_ingested(batch_id):
+            logger.info(f"Batch {batch_id} was already ingested, skipping")
+            return interfaces.StreamIngestResponse(
+                received_count=0, created_count=0, skipped_count=0, error_count=0, batch_count=0, errors=[],
+                duplicate_batch=True
+            )
+
+        for line_number, line in enumerate(self._iter_ndjson_lines(stream), start=1):
+            if line is None:
+                received_count += 1
+                report(line_number, [f"line exceeds {NDJSON_MAX_LINE_BYTES} bytes"])
+                continue
+            if not line.strip():
+                continue
+
+            received_count += 1
+            row, line_errors = self._parse_ndjson_line(line)
+            if line_errors:
+                report(line_number, line_errors)
+                continue
+
+            chunk.append((line_number, row))
+            if len(chunk) >= self._bulk_batch_size:
+                flush()
+
+        if chunk:
+            flush()
+
+        self._record_batch(batch_id, created_count)
+        logger.info(f"NDJSON ingestion finished: received={received_count}, created={created_count}, "
+                    f"skipped={skipped_count}, duplicates={duplicate_count}, errors={error_count}")
+        return interfaces.StreamIngestResponse(
+            received_count=received_count,
+            created_count=created_count,
+            skipped_count=skipped_count,
+            duplicate_count=duplicate_count,
+            error_count=error_count,
+            batch_count=batch_count,
+            errors=errors
+        )
+
+    def submit_ingestion_job(self, payload: dict) -> interfaces.IngestionJobDTO:
+        measurements = payload.get('measurements') if isinstance(payload, dict) else None
+        if not isinstance(measurements, list):
+            logger.debug("Rejected ingestion job without a measurements list")
+            raise interfaces.InvalidIngestionPayload("measurements should be a list")
+        try:
+            batch_id = BATCH_ID_ADAPTER.validate_python(payload.get('batch_id'))
+        except ValidationError:
+            logger.debug(f"Rejected ingestion job with invalid batch_id: {payload.get('batch_id')}")
+            raise interfaces.InvalidIngestionPayload("batch_id should be 4-64 characters of [a-zA-Z0-9_.-]")
+
+        job = IngestionJob.objects.create(payload=measurements, batch_id=batch_id, received_count=len(measurements))
+        logger.info(f"Queued ingestion job {job.id} with {len(measurements)} measurements")
+        return self._convert_ingestion_job_to_dataclass(job)
+
+    def get_ingestion_job(self, job_id: int) -> interfaces.IngestionJobDTO:
+        logger.info(f"Getting ingestion job with ID: {job_id}")
+
+        try:
+            job = IngestionJob.objects.defer('payload').get(id=job_id)
+        except IngestionJob.DoesNotExist:
+            logger.debug(f"Ingestion job with ID {job_id} doesn't exist")
+            raise interfaces.IngestionJobNotFound()
+        return self._convert_ingestion_job_to_dataclass(job)
+
+    def process_next_ingestion_job(self) -> Optional[interfaces.IngestionJobDTO]:
+        job = self._claim_ingestion_job()
+        if job is None:
+            return None
+
+        logger.info(f"Processing ingestion job {job.id} (attempt {job.attempts})")
+        if self._is_batch_ingested(job.batch_id):
+            logger.info(f"Batch {job.batch_id} of ingestion job {job.id} was already ingested, skipping")
+            job.status = IngestionJob.Status.COMPLETED
+            job.payload = []
+            job.lease_expires_at = None
+            job.finished_at = timezone.now()
+            job.save()
+            return self._convert_ingestion_job_to_dataclass(job)
+
+        validation = validators.validate_rows(job.payload)
+        try:
+            result = self._bulk_insert(validation.rows)
+        except Exception as e:
+            logger.error(f"Error processing ingestion job {job.id}: {e}")
+            job.status = IngestionJob.Status.PENDING if job.attempts < INGESTION_JOB_MAX_ATTEMPTS else IngestionJob.Status.FAILED
+            job.error_message = str(e)
+            job.lease_expires_at = None
+            job.finished_at = timezone.now() if job.status == IngestionJob.Status.FAILED else None
+            job.save(update_fields=['status', 'error_message', 'lease_expires_at', 'finished_at', 'updated_at'])
+            return self._convert_ingestion_job_to_dataclass(job)
+
+        job.status = IngestionJob.Status.COMPLETED
+        job.payload = []
+        job.created_count = len(result.created)
+        job.skipped_count = result.skipped_count
+        job.duplicate_count = result.duplicate_count
+        job.error_count = len(validation.errors)
+        job.errors = [error.model_dump() for error in self._report_errors(validation.errors)]
+        job.error_message = None
+        job.lease_expires_at = None
+        job.finished_at = timezone.now()
+        job.save()
+        self._record_batch(job.batch_id, job.created_count)
+
+        logger.info(f"Completed ingestion job {job.id}: created={job.created_count}, "
+                    f"skipped={job.skipped_count}, duplicates={job.duplicate_count}, errors={job.error_count}")
+        return self._convert_ingestion_job_to_dataclass(job)
+
+    @staticmethod
+    def _claim_ingestion_job() -> Optional[IngestionJob]:
+        now = timezone.now()
+        expired = Q(status=IngestionJob.Status.PROCESSING, lease_expires_at__lt=now)
+        claimable = Q(status=IngestionJob.Status.PENDING) | (expired & Q(attempts__lt=INGESTION_JOB_MAX_ATTEMPTS))
+        with transaction.atomic():
+            # a job whose every attempt lost its lease keeps taking its worker down; give up on it
+            abandoned = IngestionJob.objects.filter(expired, attempts__gte=INGESTION_JOB_MAX_ATTEMPTS).update(
+                status=IngestionJob.Status.FAILED,
+                error_message=f"Lease expired on all {INGESTION_JOB_MAX_ATTEMPTS} attempts; the worker stopped "
+                              f"while processing the job",
+                lease_expires_at=None,
+                finished_at=now,
+                updated_at=now,
+            )
+            if abandoned:
+                logger.error(f"Marked {abandoned} ingestion jobs whose lease expired on every attempt as failed")
+            job = (IngestionJob.objects
+                   .select_for_update(skip_locked=True)
+                   .filter(claimable)
+                   .order_by('id')
+                   .first())
+            if job is None:
+                return None
+            job.status = IngestionJob.Status.PROCESSING
+            job.attempts += 1
+            job.started_at = now
+            job.lease_expires_at = now + INGESTION_JOB_LEASE
+            job.save(update_fields=['status', 'attempts', 'started_at', 'lease_expires_at', 'updated_at'])
+        return job
+
     def delete_measurement(self, measurement_id: int) -> bool:
         logger.info(f"Deleting measurement with ID: {measurement_id}")
         
         try:
-            measurement = Measurement.objects.get(id=measurement_id)
-            measurement.delete()
+            with transaction.atomic():
+                measurement = Measurement.objects.get(id=measurement_id)
+                measurement.delete()
+                # min/max can't be taken back out of a rollup, so recount the measurement's cell and day
+                rollups.rebuild(measurement.timestamp, measurement.timestamp, cell_ids=[measurement.cell_id])
+                cells.remove_measurement(measurement)
+                self._invalidate_cache([measurement])
             logger.info(f"Successfully deleted measurement with ID: {measurement_id}")
             return True
         except Measurement.DoesNotExist:
@@ -183,4 +890,249 @@ class MeasurementService(interfaces.AbstractMeasurementService):
             sms_delivery_time=measurement.sms_delivery_time,
             created_at=measurement.created_at,
             updated_at=measurement.updated_at
-        ) 
\ No newline at end of file
+        )
+
+    def _bulk_insert(self, rows: Iterable[Dict]) -> BulkInsertResult:
+        """
+        Insert rows with one multi-row INSERT per batch, committing each batch separately so
+        large uploads never hold a single long transaction. Rows without a location are skipped
+        and rows whose natural key is already stored are ignored. Primary keys the backend can't
+        return from the bulk insert (MySQL) are looked up by natural key after each batch.
+        """
+        created_measurements = []
+        skipped_count = duplicate_count = 0
+        batches = []
+
+        for index, batch_rows in enumerate(self._iter_batches(rows, self._bulk_batch_size)):
+            started_at = time.perf_counter()
+            batch = [m for m in map(self._build_measurement, batch_rows) if m is not None]
+            skipped_count += len(batch_rows) - len(batch)
+
+            new_measurements = self._drop_duplicates(batch)
+            if new_measurements:
+                new_measurements = self._insert_ignoring_conflicts(new_measurements)
+                if not connection.features.can_return_rows_from_bulk_insert:
+                    self._resolve_ids(new_measurements)
+            duration_ms = (time.perf_counter() - started_at) * 1000
+
+            batch_duplicates = len(batch) - len(new_measurements)
+            duplicate_count += batch_duplicates
+            logger.debug(f"Inserted batch {index} with {len(new_measurements)} measurements "
+                         f"({batch_duplicates} duplicates) in {duration_ms:.2f} ms")
+            batches.append(interfaces.BulkInsertBatchReport(
+                index=index, size=len(new_measurements), duplicate_count=batch_duplicates, duration_ms=duration_ms
+            ))
+            created_measurements.extend(new_measurements)
+
+        return BulkInsertResult(created_measurements, skipped_count, duplicate_count, batches)
+
+    def _flush_write_behind(self, rows: List[Dict]) -> List[Optional[Measurement]]:
+        """Insert buffered rows and return, per row, the created measurement or None for a duplicate"""
+        close_old_connections()
+        result = self._bulk_insert(rows)
+        created = {m.dedup_key: m for m in result.created}
+        logger.debug(f"Flushed {len(rows)} buffered measurements, created {len(result.created)}")
+        return [
+            created.get(Measurement.build_dedup_key(row['timestamp'], row['latitude'], row['longitude'], row.get('cell_id')))
+            for row in rows
+        ]
+
+    def _insert_ignoring_conflicts(self, measurements: List[Measurement]) -> List[Measurement]:
+        """Insert measurements, with their rollups and cell summaries, skipping stored ones; returns those inserted"""
+        try:
+            with transaction.atomic():
+                self._insert_measurements(measurements)
+            return measurements
+        except IntegrityError:
+            # a concurrent upload (e.g. a client retry) stored some of the same readings after _drop_duplicates ran
+            logger.warning(f"Duplicate natural keys while inserting {len(measurements)} measurements, "
+                           f"retrying without the stored ones")
+            with transaction.atomic():
+                # a locking read: it finds the conflicting rows and keeps other uploads from inserting the
+                # remaining keys before this transaction commits, so exactly these rows are merged
+                stored = set(Measurement.objects.select_for_update().filter(
+                    dedup_key__in={m.dedup_key for m in measurements},
+                    timestamp__in={m.timestamp for m in measurements},
+                ).values_list('dedup_key', flat=True))
+                measurements = [m for m in measurements if m.dedup_key not in stored]
+                if measurements:
+                    self._insert_measurements(measurements)
+            return measurements
+
+    def _insert_measurements(self, measurements: List[Measurement]):
+        Measurement.objects.bulk_create(measurements, batch_size=self._bulk_batch_size)
+        rollups.add_measurements(measurements)
+        cells.add_measurements(measurements)
+        self._invalidate_cache(measurements)
+
+    @staticmethod
+    def _resolve_ids(measurements: List[Measurement]):
+        """Fill in the primary keys of inserted measurements with one indexed lookup on dedup_key"""
+        ids = dict(Measurement.objects.filter(
+            dedup_key__in={m.dedup_key for m in measurements}, timestamp__in={m.timestamp for m in measurements}
+        ).values_list('dedup_key', 'id'))
+        for measurement in measurements:
+            measurement.id = ids.get(measurement.dedup_key)
+
+    @staticmethod
+    def _drop_duplicates(measurements: List[Measurement]) -> List[Measurement]:
+        """
+        Drop measurements repeated within the batch or already stored, using a single
+        indexed lookup on dedup_key for the whole batch. The timestamps restrict the
+        lookup to the partitions the batch falls into.
+        """
+        keys = {m.dedup_key for m in measurements}
+        timestamps = {m.timestamp for m in measurements}
+        seen = set(Measurement.objects.filter(dedup_key__in=keys, timestamp__in=timestamps)
+                   .values_list('dedup_key', flat=True))
+        unique_measurements = []
+        for measurement in measurements:
+            if measurement.dedup_key in seen:
+                continue
+            seen.add(measurement.dedup_key)
+            unique_measurements.append(measurement)
+        return unique_measurements
+
+    @staticmethod
+    def _estimate_count(queryset) -> Optional[int]:
+        """Row estimate of the optimizer for the filtered query, None where it is not available"""
+        if connection.vendor != 'mysql':
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [column[0].lower() for column in cursor.description]
+            plan = dict(zip(columns, cursor.fetchone()))
+        if plan.get('rows') is None:
+            # e.g. "no matching row in const table"
+            return 0
+        return int(plan['rows'] * (plan.get('filtered') or 100) / 100)
+
+    @staticmethod
+    def _check_fields(fields: List[str]) -> List[str]:
+        unknown = [field for field in fields if field not in MEASUREMENT_DTO_FIELDS]
+        if unknown:
+            raise interfaces.InvalidFieldSelection(f"Unknown fields: {', '.join(unknown)}")
+        # keep the MeasurementDTO order, which is the order the fields are rendered in
+        return [field for field in MEASUREMENT_DTO_FIELDS if field in fields]
+
+    @staticmethod
+    def _encode_cursor(direction: str, timestamp: datetime, measurement_id: int) -> str:
+        position = {'d': direction, 't': timestamp.isoformat(), 'i': measurement_id}
+        return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, datetime, int]:
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            if position['d'] not in ('next', 'prev'):
+                raise ValueError(position['d'])
+            return position['d'], datetime.fromisoformat(position['t']), int(position['i'])
+        except (ValueError, TypeError, KeyError) as e:
+            logger.debug(f"Rejected list cursor {cursor!r}: {e}")
+            raise interfaces.InvalidListCursor("Invalid cursor")
+
+    @staticmethod
+    def _build_measurement(row: Dict) -> Optional[Measurement]:
+        if row.get('latitude') is None or row.get('longitude') is None:
+            return None
+        measurement = Measurement(**{field: row.get(field) for field in MEASUREMENT_FIELDS})
+        measurement.dedup_key = Measurement.build_dedup_key(
+            measurement.timestamp, measurement.latitude, measurement.longitude, measurement.cell_id
+        )
+        measurement.grid_cell = geo.grid_cell(measurement.latitude, measurement.longitude)
+        return measurement
+
+    @staticmethod
+    def _is_batch_ingested(batch_id: Optional[str]) -> bool:
+        return batch_id is not None and IngestionBatch.objects.filter(batch_id=batch_id).exists()
+
+    @staticmethod
+    def _record_batch(batch_id: Optional[str], created_count: int):
+        if batch_id is not None:
+            IngestionBatch.objects.bulk_create(
+                [IngestionBatch(batch_id=batch_id, created_count=created_count)], ignore_conflicts=True
+            )
+
+    @staticmethod
+    def _iter_batches(items: Iterable, batch_size: int) -> Iterator[List]:
+        iterator = iter(items)
+        while batch := list(islice(iterator, batch_size)):
+            yield batch
+
+    @staticmethod
+    def _iter_ndjson_lines(stream: BinaryIO) -> Iterator[Optional[bytes]]:
+        """
+        Yield raw lines from the stream without reading more than one line into memory.
+        Oversized lines are drained and yielded as None.
+        """
+        while line := stream.readline(NDJSON_MAX_LINE_BYTES + 1):
+            if len(line) > NDJSON_MAX_LINE_BYTES:
+                while line and not line.endswith(b'\n'):
+                    line = stream.readline(NDJSON_MAX_LINE_BYTES)
+                yield None
+            else:
+                yield line
+
+    @staticmethod
+    def _parse_ndjson_line(line: bytes) -> Tuple[Optional[Dict], List[str]]:
+        try:
+            data = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            return None, [f"invalid JSON: {e}"]
+        if not isinstance(data, dict):
+            return None, ["expected a JSON object"]
+        return data, []
+
+    @staticmethod
+    def _report_errors(errors: Dict[int, List[str]]) -> List[interfaces.IngestLineError]:
+        """Turn a validation error mapping into at most NDJSON_MAX_REPORTED_ERRORS 1-based row reports"""
+        return [interfaces.IngestLineError(line=index + 1, errors=row_errors)
+                for index, row_errors in islice(sorted(errors.items()), NDJSON_MAX_REPORTED_ERRORS)]
+
+    @staticmethod
+    def _convert_cell_summary_to_dataclass(summary: CellSummary) -> interfaces.CellSummaryDTO:
+        return interfaces.CellSummaryDTO(
+            plmn_id=summary.plmn_id,
+            lac=summary.lac,
+            tac=summary.tac,
+            cell_id=summary.cell_id,
+            technology=summary.technology,
+            count=summary.count,
+            first_seen=summary.first_seen,
+            last_seen=summary.last_seen,
+            metrics={
+                metric: interfaces.MetricSummary(
+                    count=stats['count'],
+                    avg=stats['sum'] / stats['count'],
+                    min=stats['min'],
+                    max=stats['max'],
+                    bin_width=cells.HISTOGRAM_BIN_WIDTHS[metric],
+                    histogram=dict(sorted(stats['histogram'].items(), key=lambda item: float(item[0]))),
+                )
+                for metric, stats in summary.metrics.items()
+            },
+            frequency_bands=summary.frequency_bands,
+            arfcns=summary.arfcns,
+        )
+
+    @staticmethod
+    def _convert_ingestion_job_to_dataclass(job: IngestionJob) -> interfaces.IngestionJobDTO:
+        return interfaces.IngestionJobDTO(
+            id=job.id,
+            batch_id=job.batch_id,
+            status=job.status,
+            attempts=job.attempts,
+            received_count=job.received_count,
+            created_count=job.created_count,
+            skipped_count=job.skipped_count,
+            duplicate_count=job.duplicate_count,
+            error_count=job.error_count,
+            errors=job.errors,
+            error_message=job.error_message,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            created_at=job.created_at,
+            updated_at=job.updated_at
+        )
+
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.measurements import interfaces
+from apps.measurements.services import MeasurementService
+
+
+class AggregationTests(TestCase):
+    def setUp(self):
+        self.service = MeasurementService()
+        start = datetime(2025, 8, 20, tzinfo=timezone.utc)
+        self.service.bulk_create_measurements(interfaces.BulkCreateMeasurementReq(measurements=[
+            {'timestamp': (start + timedelta(hours=hour)).isoformat(), 'latitude': 35.7, 'longitude': 51.4,
+             'technology': 'LTE' if hour % 2 else 'NR', 'arfcn': 1300 + hour % 3, 'rsrp': -90.0 - hour}
+            for hour in range(48)
+        ]))
+
+    def test_rejects_unbounded_aggregation_over_the_measurements(self):
+        response = APIClient().get('/measurements/aggregate/?group_by=arfcn')
+        self.assertEqual(response.status_code, 400)
+
+    def test_accepts_bounded_aggregation_over_the_measurements(self):
+        response = APIClient().get('/measurements/aggregate/?group_by=arfcn&technology=LTE')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(group['count'] for group in response.json()['groups']), 24)
+
+    def test_accepts_unbounded_aggregation_from_the_rollups(self):
+        response = APIClient().get('/measurements/aggregate/?group_by=technology')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({group['technology']: group['count'] for group in response.json()['groups']},
+                         {'LTE': 24, 'NR': 24})
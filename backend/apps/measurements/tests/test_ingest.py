@@ -0,0 +1,31 @@
+import gzip
+import json
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+
+class CompressedIngestTests(TestCase):
+    def setUp(self):
+        lines = [json.dumps({'timestamp': f'2025-08-20T10:{minute:02d}:00Z', 'latitude': 35.7, 'longitude': 51.4,
+                             'technology': 'LTE', 'rsrp': -90.0}) for minute in range(50)]
+        self.body = gzip.compress('\n'.join(lines).encode())
+
+    def _ingest(self, body: bytes):
+        return APIClient().generic('POST', '/measurements/ingest/', body, content_type='application/x-ndjson',
+                                   HTTP_CONTENT_ENCODING='gzip')
+
+    def test_ingests_a_gzip_body(self):
+        response = self._ingest(self.body)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created_count'], 50)
+
+    def test_rejects_a_truncated_gzip_body_with_a_json_error(self):
+        response = self._ingest(self.body[:len(self.body) // 2])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Malformed compressed request body", response.json()['error'])
+
+    @override_settings(DECOMPRESSED_REQUEST_MAX_SIZE=1024)
+    def test_rejects_a_body_decompressing_past_the_limit_with_a_json_error(self):
+        response = self._ingest(self.body)
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("DECOMPRESSED_REQUEST_MAX_SIZE", response.json()['error'])
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta, timezone
+from django.test import TestCase
+from rest_framework.test import APIClient
+from apps.measurements import interfaces
+from apps.measurements.services import MeasurementService
+
+
+class LocationFilterTests(TestCase):
+    def setUp(self):
+        start = datetime(2025, 8, 20, tzinfo=timezone.utc)
+        # a column of points 0.02° apart going north from Tehran, one every hour
+        MeasurementService().bulk_create_measurements(interfaces.BulkCreateMeasurementReq(measurements=[
+            {'timestamp': (start + timedelta(hours=step)).isoformat(), 'latitude': round(35.6 + step * 0.02, 2),
+             'longitude': 51.4, 'technology': 'LTE', 'rsrp': -90.0}
+            for step in range(20)
+        ]))
+
+    def test_lists_the_measurements_in_a_bounding_box_newest_first(self):
+        response = APIClient().get('/measurements/?bbox=51.3,35.65,51.5,35.75')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['latitude'] for row in response.json()['results']], [35.74, 35.72, 35.7, 35.68, 35.66])
+
+    def test_lists_the_measurements_within_a_radius(self):
+        response = APIClient().get('/measurements/?lat=35.7&lon=51.4&radius=3000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['latitude'] for row in response.json()['results']], [35.72, 35.7, 35.68])
+
+    def test_aggregates_the_measurements_in_a_bounding_box(self):
+        response = APIClient().get('/measurements/aggregate/?bbox=51.3,35.65,51.5,35.75&group_by=technology')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([group['count'] for group in response.json()['groups']], [5])
+
+    def test_clusters_need_an_integer_zoom(self):
+        client = APIClient()
+        response = client.get('/measurements/clusters/?bbox=51.3,35.65,51.5,35.75')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid parameter: zoom is required"})
+        response = client.get('/measurements/clusters/?bbox=51.3,35.65,51.5,35.75&zoom=city')
+        self.assertEqual(response.json(), {"error": "Invalid parameter: zoom must be an integer"})
+        response = client.get('/measurements/clusters/?bbox=51.3,35.65,51.5,35.75&zoom=11')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 5)
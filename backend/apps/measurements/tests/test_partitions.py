@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone as django_timezone
+from rest_framework.test import APIClient
+from apps.measurements import interfaces, partitions
+from apps.measurements.models import Measurement
+from apps.measurements.services import MeasurementService
+
+
+class PartitionMaintenanceTests(TestCase):
+    def setUp(self):
+        self.this_month = partitions.month_start(django_timezone.now().date())
+        self.expired_month = partitions.month_start(self.this_month, -2)
+        MeasurementService().bulk_create_measurements(interfaces.BulkCreateMeasurementReq(measurements=[
+            {'timestamp': datetime(month.year, month.month, day, tzinfo=timezone.utc).isoformat(),
+             'latitude': 35.7, 'longitude': 51.4, 'technology': 'LTE', 'plmn_id': '43211', 'cell_id': 7,
+             'rsrp': rsrp}
+            for month, day, rsrp in ((self.expired_month, 1, -80.0), (self.expired_month, 2, -85.0),
+                                     (self.this_month, 1, -100.0))
+        ]))
+
+    def _drop_partition(self, connection, partition):
+        next_month = partitions.month_start(partition.month, 1)
+        Measurement.objects.filter(
+            timestamp__gte=datetime(partition.month.year, partition.month.month, 1, tzinfo=timezone.utc),
+            timestamp__lt=datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc),
+        ).delete()
+
+    def test_dropping_a_partition_removes_it_from_the_rollups_and_cell_summaries(self):
+        existing = [
+            partitions.Partition(partitions.partition_name(self.expired_month), self.expired_month),
+            partitions.Partition(partitions.partition_name(self.this_month), self.this_month),
+            partitions.Partition(partitions.MAX_PARTITION, None),
+        ]
+        command = 'apps.measurements.management.commands.maintain_measurement_partitions'
+        with mock.patch(f'{command}.connection', mock.Mock(vendor='mysql')), \
+                mock.patch.object(partitions, 'list_partitions', return_value=existing), \
+                mock.patch.object(partitions, 'drop_partition', side_effect=self._drop_partition):
+            call_command('maintain_measurement_partitions', months_ahead=0, retention_months=1, stdout=StringIO())
+
+        client = APIClient()
+        groups = client.get('/measurements/aggregate/?group_by=technology&metrics=rsrp').json()['groups']
+        self.assertEqual([(group['technology'], group['count'], group['rsrp_avg']) for group in groups],
+                         [('LTE', 1, -100.0)])
+        summaries = client.get('/measurements/cells/?plmn_id=43211&cell_id=7').json()['results']
+        self.assertEqual([summary['count'] for summary in summaries], [1])
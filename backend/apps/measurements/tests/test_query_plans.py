@@ -0,0 +1,10 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class QueryPlanTests(TestCase):
+    def test_read_paths_use_an_index(self):
+        output = StringIO()
+        call_command('check_query_plans', stdout=output, stderr=StringIO())
+        self.assertIn("All measurement queries use an index", output.getvalue())
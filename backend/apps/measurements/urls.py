@@ -5,6 +5,8 @@ from . import views
 
 router = routers.DefaultRouter()
 
+# registered before the measurements routes so 'jobs/' is not captured as a measurement id
+router.register('jobs', views.IngestionJobViewSet, basename='ingestion-jobs')
 router.register('', views.MeasurementViewSet, basename='measurements')
 
 urlpatterns = [
@@ -0,0 +1,135 @@
+"""
+Batch validation of raw measurement rows.
+
+A whole upload is validated with one list-level TypeAdapter over a TypedDict, so pydantic-core checks
+types and physical ranges without building a model instance per row, and the error locations give a
+per-row error mask.
+"""
+from datetime import datetime
+from typing import Annotated, Dict, List, NamedTuple, Optional
+from pydantic import Field, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
+# Physical bounds (inclusive) of every range-checked field
+METRIC_RANGES = {
+    'latitude': (-90.0, 90.0),
+    'longitude': (-180.0, 180.0),
+    'lac': (0, 65535),
+    'rac': (0, 255),
+    'tac': (0, 16777215),
+    'cell_id': (0, 2147483647),
+    'arfcn': (0, 3279165),
+    'rsrp': (-156.0, -31.0),  # dBm, LTE and NR SS-RSRP
+    'rsrq': (-43.0, 20.0),  # dB, LTE and NR SS-RSRQ
+    'rscp': (-120.0, -25.0),  # dBm
+    'ec_no': (-24.5, 0.0),  # dB
+    'rxlev': (-120.0, -25.0),  # dBm
+    'download_rate': (0.0, 10000.0),  # Mbps
+    'upload_rate': (0.0, 10000.0),  # Mbps
+    'ping_response_time': (0.0, 120000.0),  # ms
+    'dns_response_time': (0.0, 120000.0),  # ms
+    'web_response_time': (0.0, 120000.0),  # ms
+    'sms_delivery_time': (0.0, 86400.0),  # seconds
+}
+# Column widths of the string fields
+STRING_MAX_LENGTHS = {
+    'technology': 10,
+    'plmn_id': 10,
+    'frequency_band': 20,
+}
+
+
+def _ranged(field_type: type, name: str):
+    low, high = METRIC_RANGES[name]
+    return NotRequired[Optional[Annotated[field_type, Field(ge=low, le=high)]]]
+
+
+def _bounded(name: str):
+    return NotRequired[Optional[Annotated[str, Field(max_length=STRING_MAX_LENGTHS[name])]]]
+
+
+class MeasurementRow(TypedDict):
+    timestamp: datetime
+    latitude: _ranged(float, 'latitude')
+    longitude: _ranged(float, 'longitude')
+    technology: _bounded('technology')
+    plmn_id: _bounded('plmn_id')
+    lac: _ranged(int, 'lac')
+    rac: _ranged(int, 'rac')
+    tac: _ranged(int, 'tac')
+    cell_id: _ranged(int, 'cell_id')
+    frequency_band: _bounded('frequency_band')
+    arfcn: _ranged(int, 'arfcn')
+    rsrp: _ranged(float, 'rsrp')
+    rsrq: _ranged(float, 'rsrq')
+    rscp: _ranged(float, 'rscp')
+    ec_no: _ranged(float, 'ec_no')
+    rxlev: _ranged(float, 'rxlev')
+    download_rate: _ranged(float, 'download_rate')
+    upload_rate: _ranged(float, 'upload_rate')
+    ping_response_time: _ranged(float, 'ping_response_time')
+    dns_response_time: _ranged(float, 'dns_response_time')
+    web_response_time: _ranged(float, 'web_response_time')
+    sms_delivery_time: _ranged(float, 'sms_delivery_time')
+
+
+ROWS_ADAPTER = TypeAdapter(List[MeasurementRow])
+
+
+class BatchValidationResult(NamedTuple):
+    rows: List[Dict]  # valid rows, in input order
+    error_mask: List[bool]  # True where the input row was rejected
+    errors: Dict[int, List[str]]  # input index -> messages
+
+
+def validate_rows(rows: list) -> BatchValidationResult:
+    try:
+        return BatchValidationResult(ROWS_ADAPTER.validate_python(rows), [False] * len(rows), {})
+    except ValidationError as e:
+        errors = _group_errors(e)
+
+    # a second pass over the rows that produced no errors cannot fail
+    valid_rows = ROWS_ADAPTER.validate_python([row for index, row in enumerate(rows) if index not in errors])
+    return BatchValidationResult(valid_rows, [index in errors for index in range(len(rows))], errors)
+
+
+def check_column_ranges(columns: Dict[str, list]) -> Dict[int, List[str]]:
+    """
+    Range and length check already typed columns (None meaning null) and return row index -> messages, worded
+    like the errors validate_rows reports for the same rows.
+    """
+    errors = {}
+    for name, values in columns.items():
+        if name in METRIC_RANGES:
+            low, high = METRIC_RANGES[name]
+            for index, value in enumerate(values):
+                if value is not None and value < low:
+                    errors.setdefault(index, []).append(
+                        f"{name}: Input should be greater than or equal to {_format_bound(low)}"
+                    )
+                elif value is not None and value > high:
+                    errors.setdefault(index, []).append(
+                        f"{name}: Input should be less than or equal to {_format_bound(high)}"
+                    )
+        elif name in STRING_MAX_LENGTHS:
+            max_length = STRING_MAX_LENGTHS[name]
+            for index, value in enumerate(values):
+                if value is not None and len(value) > max_length:
+                    errors.setdefault(index, []).append(
+                        f"{name}: String should have at most {max_length} characters"
+                    )
+    return errors
+
+
+def _format_bound(bound: float) -> str:
+    # pydantic-core prints whole float bounds without their fraction
+    return str(int(bound)) if float(bound).is_integer() else str(bound)
+
+
+def _group_errors(error: ValidationError) -> Dict[int, List[str]]:
+    errors = {}
+    for detail in error.errors(include_url=False):
+        index, *field = detail['loc']
+        message = f"{'.'.join(str(part) for part in field)}: {detail['msg']}" if field else detail['msg']
+        errors.setdefault(index, []).append(message)
+    return errors
@@ -1,12 +1,27 @@
 from rest_framework import viewsets, response, status
 from rest_framework.decorators import action
-from django.http import JsonResponse
+from rest_framework.settings import api_settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 import logging
+from datetime import datetime
 from runner.bootstrap import get_bootstrapper
-from . import interfaces
+from . import filters, interfaces
+from .models import IngestionJob
+from .parsers import ColumnarMessagePackParser
 
 logger = logging.getLogger(__name__)
 
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl')
+BULK_RESPONSE_MODES = ('summary', 'ids', 'full')
+WRITE_ACK_MODES = ('buffered', 'durable')
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
 class MeasurementViewSet(viewsets.GenericViewSet):
 
     def create(self, request):
@@ -15,10 +30,29 @@ class MeasurementViewSet(viewsets.GenericViewSet):
         service = get_bootstrapper().get_measurements_service()
         
         try:
+            ack = request.query_params.get('ack', 'durable')
+            if ack not in WRITE_ACK_MODES:
+                raise ValueError(f"ack should be one of: {', '.join(WRITE_ACK_MODES)}")
             create_request = interfaces.CreateMeasurementReq(**request.data)
-            result = service.create_measurement(request=create_request)
+            result = service.enqueue_measurement(request=create_request, durable=ack == 'durable')
+            if result is None:
+                logger.info("Buffered measurement for write-behind")
+                return response.Response({"status": "buffered"}, status=status.HTTP_202_ACCEPTED)
             logger.info(f"Successfully created measurement with ID: {result.id}")
             return response.Response(result.model_dump(), status=status.HTTP_201_CREATED)
+        except interfaces.WriteBehindBufferFull as e:
+            logger.warning(f"Write-behind buffer full: {str(e)}")
+            return response.Response(
+                {"error": str(e)},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': '1'}
+            )
+        except interfaces.WriteBehindTimeout:
+            logger.error("Timed out waiting for buffered measurement to be written")
+            return response.Response(
+                {"error": "Timed out waiting for the measurement to be written"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
         except Exception as e:
             logger.error(f"Error creating measurement: {str(e)}")
             return response.Response(
@@ -33,9 +67,20 @@ class MeasurementViewSet(viewsets.GenericViewSet):
         
         try:
             measurement_id = int(pk)
-            result = service.get_measurement(measurement_id=measurement_id)
+            fields = self._get_fields(request)
+            if self._renders_plain_json(request):
+                content = service.get_measurement_json(measurement_id=measurement_id, fields=fields)
+                logger.info(f"Successfully retrieved measurement with ID: {measurement_id}")
+                return HttpResponse(content, content_type='application/json')
+            result = service.get_measurement(measurement_id=measurement_id, fields=fields)
             logger.info(f"Successfully retrieved measurement with ID: {measurement_id}")
-            return response.Response(result.model_dump())
+            return response.Response(result.model_dump(exclude_unset=bool(fields)))
+        except interfaces.InvalidFieldSelection as e:
+            logger.error(f"Invalid fields in retrieve request: {str(e)}")
+            return response.Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except (ValueError, interfaces.MeasurementNotFound):
             logger.warning(f"Measurement with ID {pk} not found")
             return response.Response(
@@ -86,14 +131,23 @@ class MeasurementViewSet(viewsets.GenericViewSet):
                 start_date=start_date,
                 end_date=end_date,
                 limit=int(request.query_params.get('limit', 100)),
-                offset=int(request.query_params.get('offset', 0))
+                offset=int(request.query_params.get('offset', 0)),
+                cursor=request.query_params.get('cursor') or None,
+                count=request.query_params.get('count', 'exact'),
+                order_by=request.query_params.get('order_by', '-timestamp'),
+                fields=self._get_fields(request),
+                **self._get_location_filters(request),
+                **self._get_cell_filters(request),
+                **self._get_declared_filters(request)
             )
             
             logger.debug(f"Executing list_measurements with filters: technology={list_request.technology}, start_date={list_request.start_date}, end_date={list_request.end_date}, limit={list_request.limit}, offset={list_request.offset}")
             
+            if self._renders_plain_json(request):
+                return HttpResponse(service.list_measurements_json(request=list_request), content_type='application/json')
             result = service.list_measurements(request=list_request)
             logger.info(f"Successfully retrieved {len(result.results)} measurements out of {result.count} total")
-            return response.Response(result.model_dump())
+            return response.Response(result.model_dump(exclude_unset=bool(list_request.fields)))
         except ValueError as e:
             logger.error(f"Invalid parameter in list request: {str(e)}")
             return response.Response(
@@ -124,20 +178,329 @@ class MeasurementViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-    @action(detail=False, methods=['post'])
+    @action(detail=False, methods=['post'], parser_classes=[*api_settings.DEFAULT_PARSER_CLASSES, ColumnarMessagePackParser])
     def bulk_create(self, request):
-        """Create multiple measurements in bulk"""
-        logger.info(f"Processing bulk create request with {len(request.data.get('measurements', []))} measurements")
+        """Create multiple measurements in bulk from JSON or the columnar MessagePack format"""
         service = get_bootstrapper().get_measurements_service()
         
         try:
-            bulk_request = interfaces.BulkCreateMeasurementReq(**request.data)
-            result = service.bulk_create_measurements(request=bulk_request)
+            response_mode = self._get_bulk_response_mode(request)
+            if isinstance(request.data, interfaces.ColumnarMeasurementBatch):
+                logger.info(f"Processing columnar bulk create request with {request.data.count} measurements")
+                result = service.bulk_create_measurements_columnar(batch=request.data, response_mode=response_mode)
+            else:
+                logger.info(f"Processing bulk create request with {len(request.data.get('measurements', []))} measurements")
+                bulk_request = interfaces.BulkCreateMeasurementReq(**request.data)
+                result = service.bulk_create_measurements(request=bulk_request, response_mode=response_mode)
             logger.info(f"Successfully created {result.created_count} measurements in bulk")
-            return response.Response(result.model_dump(), status=status.HTTP_201_CREATED)
+            return response.Response(
+                result.model_dump(exclude={field for field in ('ids', 'results') if getattr(result, field) is None}),
+                status=status.HTTP_201_CREATED
+            )
         except Exception as e:
             logger.error(f"Error in bulk create request: {str(e)}")
             return response.Response(
                 {"error": str(e)}, 
                 status=status.HTTP_400_BAD_REQUEST
-            ) 
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _get_bulk_response_mode(request) -> str:
+        """
+        Pick the bulk create response mode from the `response` query parameter, falling back to the
+        `Prefer: return=minimal|representation` header. The lean summary is the default.
+        """
+        mode = request.query_params.get('response')
+        if mode is None:
+            prefer = request.headers.get('Prefer', '').replace(' ', '').lower()
+            mode = 'full' if 'return=representation' in prefer else 'summary'
+        if mode not in BULK_RESPONSE_MODES:
+            raise ValueError(f"Invalid response mode '{mode}'. Use one of: {', '.join(BULK_RESPONSE_MODES)}")
+        return mode
+
+    @staticmethod
+    def _renders_plain_json(request) -> bool:
+        """
+        Whether the negotiated response is plain JSON, which the service encodes directly from the
+        database rows; the browsable API and indented JSON go through the DRF renderers.
+        """
+        return request.accepted_renderer.format == 'json' and 'indent' not in request.accepted_media_type
+
+    @staticmethod
+    def _get_fields(request):
+        """Comma separated `fields` query parameter as a list, None when all fields are wanted"""
+        fields = [field.strip() for field in request.query_params.get('fields', '').split(',') if field.strip()]
+        return fields or None
+
+    @action(detail=False, methods=['post'])
+    def ingest(self, request):
+        """Stream newline-delimited JSON measurements into the database in bounded chunks"""
+        content_type = request.content_type.split(';')[0].strip()
+        logger.info(f"Processing NDJSON ingest request with content type: {content_type}")
+
+        if content_type not in NDJSON_CONTENT_TYPES:
+            return response.Response(
+                {"error": f"Unsupported content type. Use one of: {', '.join(NDJSON_CONTENT_TYPES)}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+
+        service = get_bootstrapper().get_measurements_service()
+        try:
+            # Read from the underlying Django request so DRF never buffers the whole body.
+            result = service.ingest_measurements_stream(
+                stream=request._request,
+                batch_id=request.headers.get('X-Batch-Id')
+            )
+        except interfaces.InvalidIngestionPayload as e:
+            logger.error(f"Invalid NDJSON ingest request: {str(e)}")
+            return response.Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        logger.info(f"Ingested {result.created_count} measurements with {result.error_count} invalid lines")
+        return response.Response(result.model_dump(), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream every measurement matching the list filters as CSV, NDJSON, Parquet or Arrow IPC"""
+        logger.info(f"Processing export request with params: {dict(request.query_params)}")
+        service = get_bootstrapper().get_measurements_service()
+
+        # `format` is taken by DRF's format suffix negotiation
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_CONTENT_TYPES:
+            return response.Response(
+                {"error": f"Invalid output. Use one of: {', '.join(EXPORT_CONTENT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            export_request = interfaces.MeasurementListReq(
+                technology=request.query_params.get('technology'),
+                start_date=self._parse_date(request.query_params.get('start_date')),
+                end_date=self._parse_date(request.query_params.get('end_date')),
+                fields=self._get_fields(request),
+                **self._get_location_filters(request),
+                **self._get_cell_filters(request),
+                **self._get_declared_filters(request)
+            )
+            chunks = service.export_measurements(request=export_request, output=output)
+        except (ValueError, interfaces.InvalidFieldSelection, interfaces.InvalidFilter) as e:
+            logger.error(f"Invalid parameter in export request: {str(e)}")
+            return response.Response(
+                {"error": f"Invalid parameter: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        export_response = StreamingHttpResponse(chunks, content_type=EXPORT_CONTENT_TYPES[output])
+        export_response['Content-Disposition'] = f'attachment; filename="measurements.{output}"'
+        return export_response
+
+    @action(detail=False, methods=['get'])
+    def aggregate(self, request):
+        """Count and summarize measurements matching the list filters, grouped in the database"""
+        logger.info(f"Processing aggregate request with params: {dict(request.query_params)}")
+        service = get_bootstrapper().get_measurements_service()
+
+        try:
+            aggregate_request = interfaces.MeasurementAggregateReq(
+                technology=request.query_params.get('technology'),
+                start_date=self._parse_date(request.query_params.get('start_date')),
+                end_date=self._parse_date(request.query_params.get('end_date')),
+                group_by=self._get_list(request, 'group_by'),
+                bucket=request.query_params.get('bucket') or None,
+                metrics=self._get_list(request, 'metrics'),
+                aggregates=self._get_list(request, 'aggregates') or ['avg', 'min', 'max'],
+                limit=int(request.query_params.get('limit', 1000)),
+                **self._get_location_filters(request),
+                **self._get_cell_filters(request),
+                **self._get_declared_filters(request)
+            )
+            result = service.aggregate_measurements(request=aggregate_request)
+        except (ValueError, interfaces.InvalidAggregation, interfaces.InvalidFilter) as e:
+            logger.error(f"Invalid parameter in aggregate request: {str(e)}")
+            return response.Response(
+                {"error": f"Invalid parameter: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        logger.info(f"Successfully aggregated measurements into {len(result.groups)} groups")
+        return response.Response(result.model_dump())
+
+    @action(detail=False, methods=['get'])
+    def cells(self, request):
+        """Maintained per-cell summaries of the cells matching plmn_id, lac, tac and cell_id"""
+        logger.info(f"Processing cells request with params: {dict(request.query_params)}")
+        service = get_bootstrapper().get_measurements_service()
+
+        try:
+            cells_request = interfaces.CellSummaryReq(
+                limit=int(request.query_params.get('limit', 100)),
+                **self._get_cell_filters(request)
+            )
+        except ValueError as e:
+            logger.error(f"Invalid parameter in cells request: {str(e)}")
+            return response.Response(
+                {"error": f"Invalid parameter: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        result = service.list_cell_summaries(request=cells_request)
+        return response.Response(result.model_dump())
+
+    @action(detail=False, methods=['get'], url_path=r'heatmap/(?P<zoom>\d+)/(?P<x>\d+)/(?P<y>\d+)')
+    def heatmap(self, request, zoom=None, x=None, y=None):
+        """Binned sample count, mean rsrp and mean download rate of one slippy map tile"""
+        logger.info(f"Processing heatmap request for tile {zoom}/{x}/{y} with params: {dict(request.query_params)}")
+        service = get_bootstrapper().get_measurements_service()
+
+        try:
+            tile_request = interfaces.HeatmapTileReq(
+                zoom=int(zoom),
+                x=int(x),
+                y=int(y),
+                technology=request.query_params.get('technology'),
+                start_date=self._parse_date(request.query_params.get('start_date')),
+                end_date=self._parse_date(request.query_params.get('end_date')),
+                **self._get_declared_filters(request)
+            )
+            result = service.get_heatmap_tile(request=tile_request)
+        except (ValueError, interfaces.InvalidFilter) as e:
+            logger.error(f"Invalid parameter in heatmap request: {str(e)}")
+            return response.Response(
+                {"error": f"Invalid parameter: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return response.Response(result.model_dump())
+
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """Bounded number of point clusters for a map viewport (`bbox`) at a zoom level"""
+        logger.info(f"Processing clusters request with params: {dict(request.query_params)}")
+        service = get_bootstrapper().get_measurements_service()
+
+        try:
+            location_filters = self._get_location_filters(request)
+            if 'bbox' not in location_filters:
+                raise ValueError("bbox is required")
+            zoom = request.query_params.get('zoom')
+            if not zoom:
+                raise ValueError("zoom is required")
+            if not zoom.lstrip('-').isdigit():
+                raise ValueError("zoom must be an integer")
+            cluster_request = interfaces.MeasurementClusterReq(
+                bbox=location_filters['bbox'],
+                zoom=int(zoom),
+                technology=request.query_params.get('technology'),
+                start_date=self._parse_date(request.query_params.get('start_date')),
+                end_date=self._parse_date(request.query_params.get('end_date')),
+                max_clusters=int(request.query_params.get('max_clusters', 500)),
+                **self._get_declared_filters(request)
+            )
+            result = service.cluster_measurements(request=cluster_request)
+        except (ValueError, interfaces.InvalidFilter) as e:
+            logger.error(f"Invalid parameter in clusters request: {str(e)}")
+            return response.Response(
+                {"error": f"Invalid parameter: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return response.Response(result.model_dump())
+
+    @staticmethod
+    def _get_location_filters(request) -> dict:
+        """
+        `bbox=min_longitude,min_latitude,max_longitude,max_latitude` and `lat`, `lon` plus `radius` (meters)
+        query parameters as list request arguments
+        """
+        filters = {}
+        bbox = request.query_params.get('bbox')
+        if bbox:
+            corners = bbox.split(',')
+            if len(corners) != 4:
+                raise ValueError("bbox should be min_longitude,min_latitude,max_longitude,max_latitude")
+            filters['bbox'] = interfaces.BoundingBox(
+                **dict(zip(('min_longitude', 'min_latitude', 'max_longitude', 'max_latitude'), map(float, corners)))
+            )
+        radius = request.query_params.get('radius')
+        if radius:
+            if not request.query_params.get('lat') or not request.query_params.get('lon'):
+                raise ValueError("radius needs lat and lon")
+            filters['radius'] = interfaces.RadiusFilter(
+                latitude=float(request.query_params['lat']),
+                longitude=float(request.query_params['lon']),
+                meters=float(radius),
+            )
+        return filters
+
+    @staticmethod
+    def _get_cell_filters(request) -> dict:
+        """`plmn_id`, `lac`, `tac` and `cell_id` query parameters as list request arguments"""
+        return {
+            name: request.query_params[name]
+            for name in ('plmn_id', 'lac', 'tac', 'cell_id') if request.query_params.get(name)
+        }
+
+    @classmethod
+    def _get_declared_filters(cls, request) -> dict:
+        """
+        Lookup style query parameters (`rsrp__lte=-90`, `technology__in=LTE,NR`) as request arguments;
+        unknown lookups are rejected rather than silently ignored
+        """
+        declared = {}
+        for name in request.query_params:
+            if '__' not in name:
+                continue
+            if name not in filters.LOOKUPS:
+                raise ValueError(f"unsupported filter {name}")
+            declared[name] = cls._get_list(request, name) if name.endswith('__in') \
+                else request.query_params[name]
+        return declared
+
+    @staticmethod
+    def _get_list(request, name):
+        """Comma separated query parameter as a list"""
+        return [value.strip() for value in request.query_params.get(name, '').split(',') if value.strip()]
+
+    @staticmethod
+    def _parse_date(value):
+        """Parse an ISO 8601 query parameter, accepting a trailing Z"""
+        if not value:
+            return None
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class IngestionJobViewSet(viewsets.GenericViewSet):
+
+    def create(self, request):
+        """Queue a bulk upload for asynchronous ingestion"""
+        logger.info("Processing asynchronous ingestion request")
+        service = get_bootstrapper().get_measurements_service()
+
+        try:
+            job = service.submit_ingestion_job(payload=request.data)
+        except interfaces.InvalidIngestionPayload as e:
+            logger.error(f"Invalid ingestion payload: {str(e)}")
+            return response.Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        location = request.build_absolute_uri(reverse('ingestion-jobs-detail', args=[job.id]))
+        logger.info(f"Accepted ingestion job {job.id}")
+        return response.Response(job.model_dump(), status=status.HTTP_202_ACCEPTED, headers={'Location': location})
+
+    def retrieve(self, request, pk=None):
+        """Get ingestion job status; 202 while the job is still queued or running"""
+        logger.info(f"Processing retrieve request for ingestion job ID: {pk}")
+        service = get_bootstrapper().get_measurements_service()
+
+        try:
+            job = service.get_ingestion_job(job_id=int(pk))
+        except (ValueError, interfaces.IngestionJobNotFound):
+            logger.warning(f"Ingestion job with ID {pk} not found")
+            return response.Response(
+                {"error": "Ingestion job not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        finished = job.status in (IngestionJob.Status.COMPLETED, IngestionJob.Status.FAILED)
+        return response.Response(job.model_dump(), status=status.HTTP_200_OK if finished else status.HTTP_202_ACCEPTED)
+
@@ -0,0 +1,100 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class BufferFull(Exception):
+    pass
+
+
+class WriteBehindBuffer:
+    """
+    Bounded in-process buffer that turns single measurement writes into multi-row inserts.
+
+    A background thread flushes buffered rows every flush_interval_ms or as soon as flush_rows rows are
+    waiting. Producers block for up to enqueue_timeout_ms when max_rows rows are already buffered and
+    then get BufferFull. Every enqueued row gets a Future that is resolved with the flush
+    outcome, so callers can either return immediately or wait for the commit. Pending rows are flushed
+    when the process exits.
+    """
+
+    def __init__(self, max_rows: int, flush_rows: int, flush_interval_ms: int, enqueue_timeout_ms: int):
+        if not 0 < flush_rows <= max_rows:
+            raise ValueError("flush_rows should be between 1 and max_rows")
+        self._max_rows = max_rows
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval_ms / 1000
+        self._enqueue_timeout = enqueue_timeout_ms / 1000
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._flush = None
+        self._thread = None
+
+    def start(self, flush: Callable[[List[Dict]], List]):
+        """Start flushing with a callable that inserts rows and returns one outcome per row"""
+        self._flush = flush
+        self._thread = threading.Thread(target=self._run, name='measurements-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def enqueue(self, row: Dict) -> Future:
+        future = Future()
+        deadline = time.monotonic() + self._enqueue_timeout
+        with self._condition:
+            while len(self._items) >= self._max_rows and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BufferFull(f"write-behind buffer is full ({self._max_rows} rows)")
+                self._condition.wait(remaining)
+            if self._closed:
+                raise BufferFull("write-behind buffer is closed")
+            self._items.append((row, future))
+            if len(self._items) >= self._flush_rows:
+                self._condition.notify_all()
+        return future
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        logger.info("Write-behind buffer closed")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self._flush_interval
+                while len(self._items) < self._flush_rows and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed and not self._items:
+                    return
+                batch = [self._items.popleft() for _ in range(min(len(self._items), self._flush_rows))]
+                # wake producers blocked on a full buffer
+                self._condition.notify_all()
+
+            if batch:
+                self._flush_batch(batch)
+
+    def _flush_batch(self, batch: List):
+        try:
+            outcomes = self._flush([row for row, _ in batch])
+        except Exception as e:
+            logger.error(f"Write-behind flush of {len(batch)} rows failed: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), outcome in zip(batch, outcomes):
+            future.set_result(outcome)
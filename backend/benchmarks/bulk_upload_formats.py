@@ -0,0 +1,84 @@
+"""
+Compare the JSON and columnar MessagePack bulk upload formats.
+
+Measures the encoded body size and how many rows per second the server-side decode and
+validation step handles before rows reach the bulk insert path. No database is needed.
+
+    python -m benchmarks.bulk_upload_formats --rows 10000
+"""
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from apps.measurements import codecs, interfaces, validators
+
+
+def build_rows(count: int) -> list:
+    started_at = datetime(2025, 8, 21, tzinfo=timezone.utc)
+    rows = []
+    for index in range(count):
+        technology = random.choice(['LTE', 'UMTS', 'GSM'])
+        rows.append({
+            'timestamp': started_at + timedelta(seconds=10 * index),
+            'latitude': 35.7 + random.random() / 10,
+            'longitude': 51.4 + random.random() / 10,
+            'technology': technology,
+            'plmn_id': '43211',
+            'lac': random.randint(1, 65535) if technology != 'LTE' else None,
+            'rac': None,
+            'tac': random.randint(1, 65535) if technology == 'LTE' else None,
+            'cell_id': random.randint(1, 268435455),
+            'frequency_band': 'B3' if technology == 'LTE' else None,
+            'arfcn': random.randint(0, 65535),
+            'rsrp': random.uniform(-140, -44) if technology == 'LTE' else None,
+            'rsrq': random.uniform(-20, -3) if technology == 'LTE' else None,
+            'rscp': random.uniform(-120, -25) if technology == 'UMTS' else None,
+            'ec_no': random.uniform(-24, 0) if technology == 'UMTS' else None,
+            'rxlev': random.uniform(-110, -48) if technology == 'GSM' else None,
+            'download_rate': random.uniform(0, 100) if index % 10 == 0 else None,
+            'upload_rate': random.uniform(0, 50) if index % 10 == 0 else None,
+            'ping_response_time': random.uniform(10, 300) if index % 10 == 0 else None,
+            'dns_response_time': None,
+            'web_response_time': None,
+            'sms_delivery_time': None,
+        })
+    return rows
+
+
+def decode_json(body: bytes) -> int:
+    bulk_request = interfaces.BulkCreateMeasurementReq(**json.loads(body))
+    return len(validators.validate_rows(bulk_request.measurements).rows)
+
+
+def decode_columnar(body: bytes) -> int:
+    return len(codecs.decode_columnar_rows(codecs.decode_columnar(body)).rows)
+
+
+def measure(decode, body: bytes, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        decode(body)
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    json_body = json.dumps({'measurements': rows}, default=lambda value: value.isoformat()).encode()
+    columnar_body = codecs.encode_columnar(rows)
+
+    print(f"{'format':<12}{'bytes':>12}{'bytes/row':>12}{'rows/sec':>14}")
+    for name, body, decode in (('json', json_body, decode_json), ('columnar', columnar_body, decode_columnar)):
+        seconds = measure(decode, body, args.repeat)
+        print(f"{name:<12}{len(body):>12}{len(body) / args.rows:>12.1f}{args.rows / seconds:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
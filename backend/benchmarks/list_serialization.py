@@ -0,0 +1,85 @@
+"""
+Compare the ways a measurement list page is turned into a JSON response body.
+
+``drf`` is the path list responses took before the fast path: ORM model instances, one MeasurementDTO
+per row, model_dump() and DRF's JSONRenderer. ``fast`` is what the list endpoint does now for plain JSON:
+values_list() tuples zipped into dicts and encoded with orjson. Both are fed the same rows without a
+database, so the numbers show the serialization cost only. Reports rows/sec, peak allocated memory and
+whether both bodies are byte-identical.
+
+    python -m benchmarks.list_serialization --rows 1000
+"""
+import argparse
+import os
+import time
+import tracemalloc
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'runner.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from apps.measurements import codecs, interfaces  # noqa: E402
+from apps.measurements.models import Measurement  # noqa: E402
+from apps.measurements.services import MEASUREMENT_DTO_FIELDS, MeasurementService  # noqa: E402
+from benchmarks.bulk_upload_formats import build_rows  # noqa: E402
+
+
+def build_page(count: int):
+    rows = build_rows(count)
+    for index, row in enumerate(rows, start=1):
+        row.update(id=index, created_at=row['timestamp'], updated_at=row['timestamp'])
+    instances = [Measurement(**row) for row in rows]
+    tuples = [tuple(row[field] for field in MEASUREMENT_DTO_FIELDS) for row in rows]
+    return instances, tuples
+
+
+def render_drf(instances: list) -> bytes:
+    response = interfaces.MeasurementListResponse(
+        count=len(instances),
+        results=[MeasurementService._convert_measurement_to_dataclass(m) for m in instances],
+    )
+    return JSONRenderer().render(response.model_dump())
+
+
+def render_fast(tuples: list) -> bytes:
+    float_indexes = [index for index, field in enumerate(MEASUREMENT_DTO_FIELDS) if field in codecs.FLOAT_COLUMNS]
+    return codecs.encode_json({
+        'count': len(tuples),
+        'count_type': 'exact',
+        'results': [dict(zip(MEASUREMENT_DTO_FIELDS, row)) for row in tuples],
+        'next_cursor': None,
+        'prev_cursor': None,
+    }, floats=(row[index] for row in tuples for index in float_indexes))
+
+
+def measure(render, page: list, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        render(page)
+        best = min(best, time.perf_counter() - started_at)
+
+    tracemalloc.start()
+    render(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    instances, tuples = build_page(args.rows)
+    print(f"{'path':<8}{'rows/sec':>12}{'peak KiB':>12}{'body bytes':>12}")
+    for name, render, page in (('drf', render_drf, instances), ('fast', render_fast, tuples)):
+        seconds, peak = measure(render, page, args.repeat)
+        print(f"{name:<8}{args.rows / seconds:>12.0f}{peak / 1024:>12.0f}{len(render(page)):>12}")
+    print(f"byte-identical: {render_drf(instances) == render_fast(tuples)}")
+
+
+if __name__ == '__main__':
+    main()
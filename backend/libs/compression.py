@@ -0,0 +1,164 @@
+import gzip
+import io
+import logging
+import zlib
+import zstandard
+from django.conf import settings
+from django.core.exceptions import BadRequest, RequestDataTooBig
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence, compress_string
+
+logger = logging.getLogger(__name__)
+
+ZSTD_LEVEL = 3
+GZIP_MAX_RANDOM_BYTES = 100
+
+
+class MalformedRequestBody(BadRequest):
+    pass
+
+
+class DecompressedRequestTooBig(RequestDataTooBig):
+    pass
+
+
+class _BoundedReader(io.RawIOBase):
+    """Reads decompressed bytes and refuses to produce more than max_size of them"""
+
+    def __init__(self, source, max_size: int):
+        self._source = source
+        self._remaining = max_size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            # ask for one byte past the limit so an oversized body is detected rather than truncated
+            data = self._source.read(min(len(buffer), self._remaining + 1))
+        except (OSError, EOFError, zlib.error, zstandard.ZstdError) as e:
+            raise MalformedRequestBody(f"Malformed compressed request body: {e}")
+        if len(data) > self._remaining:
+            raise DecompressedRequestTooBig("Decompressed request body exceeded settings.DECOMPRESSED_REQUEST_MAX_SIZE.")
+        self._remaining -= len(data)
+        buffer[:len(data)] = data
+        return len(data)
+
+
+class RequestDecompressionMiddleware:
+    """
+    Transparently decompress gzip/zstd request bodies on the ingest endpoints.
+
+    The body is decompressed lazily while the view reads it, so streaming endpoints keep
+    flat memory, and reading more than DECOMPRESSED_REQUEST_MAX_SIZE bytes is rejected
+    to guard against decompression bombs. Either failure surfaces in the view, which lets
+    it propagate and gets a JSON error from process_exception.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        encoding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding and encoding != 'identity' and request.path.startswith(settings.DECOMPRESSED_REQUEST_PATHS):
+            if encoding == 'gzip':
+                source = gzip.GzipFile(fileobj=request._stream, mode='rb')
+            elif encoding == 'zstd':
+                source = zstandard.ZstdDecompressor().stream_reader(request._stream)
+            else:
+                logger.info(f"Rejected request body with unsupported Content-Encoding: {encoding}")
+                return JsonResponse(
+                    {"error": f"Unsupported Content-Encoding: {encoding}. Use gzip or zstd"},
+                    status=415
+                )
+
+            logger.debug(f"Decompressing {encoding} request body for {request.path}")
+            request._stream = io.BufferedReader(_BoundedReader(source, settings.DECOMPRESSED_REQUEST_MAX_SIZE))
+            del request.META['HTTP_CONTENT_ENCODING']
+
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, MalformedRequestBody):
+            logger.info(f"Rejected malformed compressed request body for {request.path}: {exception}")
+            return JsonResponse({"error": str(exception)}, status=400)
+        if isinstance(exception, DecompressedRequestTooBig):
+            logger.info(f"Rejected oversized decompressed request body for {request.path}")
+            return JsonResponse({"error": str(exception)}, status=413)
+        return None
+
+
+class ResponseCompressionMiddleware:
+    """
+    Compress responses larger than COMPRESSED_RESPONSE_MIN_SIZE with zstd or gzip, whichever the
+    client prefers (zstd on ties). Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if response.has_header('Content-Encoding'):
+            return response
+        if response.streaming and response.is_async:
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSED_RESPONSE_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self._negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if encoding == 'zstd':
+                response.streaming_content = self._zstd_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=GZIP_MAX_RANDOM_BYTES
+                )
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'zstd':
+                compressed_content = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(response.content)
+            else:
+                compressed_content = compress_string(response.content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _negotiate(accept_encoding: str):
+        accepted = {}
+        for item in accept_encoding.split(','):
+            name, _, params = item.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+
+        # highest quality wins, zstd on ties
+        encoding = max(('zstd', 'gzip'), key=lambda name: accepted.get(name, 0))
+        return encoding if accepted.get(encoding, 0) > 0 else None
+
+    @staticmethod
+    def _zstd_sequence(sequence):
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        for item in sequence:
+            data = compressor.compress(item)
+            if data:
+                yield data
+        yield compressor.flush()
@@ -1,7 +1,11 @@
 import logging
 import os
+from django.conf import settings
+from django.core.cache import caches
 from apps.measurements.services import MeasurementService
+from apps.measurements.write_behind import WriteBehindBuffer
 from apps.measurements import interfaces as measurement_interfaces
+from utils.cache.services import TieredCache
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +19,34 @@ class Bootstrapper:
         return cls.instance
 
     def __init__(self, **kwargs) -> None:
-        self._measurements_service = MeasurementService()
+        # __new__ hands out the same instance on every call, which must keep its buffer, cache and service
+        if getattr(self, '_initialized', False):
+            return
+        write_behind_buffer = None
+        if settings.MEASUREMENTS_WRITE_BEHIND_ENABLED:
+            write_behind_buffer = WriteBehindBuffer(
+                max_rows=settings.MEASUREMENTS_WRITE_BEHIND_MAX_ROWS,
+                flush_rows=settings.MEASUREMENTS_WRITE_BEHIND_FLUSH_ROWS,
+                flush_interval_ms=settings.MEASUREMENTS_WRITE_BEHIND_FLUSH_INTERVAL_MS,
+                enqueue_timeout_ms=settings.MEASUREMENTS_WRITE_BEHIND_ENQUEUE_TIMEOUT_MS,
+            )
+        cache = None
+        if settings.MEASUREMENTS_CACHE_ENABLED:
+            cache = TieredCache(
+                shared=caches[settings.MEASUREMENTS_CACHE_ALIAS],
+                max_entries=settings.MEASUREMENTS_CACHE_MAX_ENTRIES,
+            )
+        self._measurements_service = MeasurementService(
+            bulk_batch_size=settings.MEASUREMENTS_BULK_BATCH_SIZE,
+            write_behind_buffer=write_behind_buffer,
+            cache=cache,
+            cache_seconds=settings.MEASUREMENTS_CACHE_SECONDS,
+            heatmap_cache_seconds=settings.MEASUREMENTS_HEATMAP_CACHE_SECONDS,
+        )
+        self._initialized = True
 
     def get_measurements_service(self) -> measurement_interfaces.AbstractMeasurementService:
         """Get measurements service instance"""
-        # For now, return a simple instance without dependencies
-        # In a real implementation, you would inject dependencies like cache service
         return self._measurements_service
 
 
@@ -56,6 +56,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'libs.compression.ResponseCompressionMiddleware',
+    'libs.compression.RequestDecompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -160,6 +162,60 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared by the API and the ingestion workers when REDIS_URL is set, so a write in any process invalidates
+# the cached responses of all of them; otherwise every process has its own (and only sees its own writes).
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Measurements ingestion
+# Number of rows written per multi-row INSERT (and per transaction) by bulk ingestion.
+MEASUREMENTS_BULK_BATCH_SIZE = int(os.getenv('MEASUREMENTS_BULK_BATCH_SIZE', '1000'))
+# Write-behind buffering of single measurement POSTs (per process), flushed as multi-row inserts
+# every FLUSH_INTERVAL_MS or as soon as FLUSH_ROWS rows are waiting.
+MEASUREMENTS_WRITE_BEHIND_ENABLED = os.getenv('MEASUREMENTS_WRITE_BEHIND_ENABLED', 'False').lower() == 'true'
+MEASUREMENTS_WRITE_BEHIND_FLUSH_INTERVAL_MS = int(os.getenv('MEASUREMENTS_WRITE_BEHIND_FLUSH_INTERVAL_MS', '200'))
+MEASUREMENTS_WRITE_BEHIND_FLUSH_ROWS = int(os.getenv('MEASUREMENTS_WRITE_BEHIND_FLUSH_ROWS', '500'))
+MEASUREMENTS_WRITE_BEHIND_MAX_ROWS = int(os.getenv('MEASUREMENTS_WRITE_BEHIND_MAX_ROWS', '10000'))
+# How long a request waits for room in a full buffer before it is answered with 429
+MEASUREMENTS_WRITE_BEHIND_ENQUEUE_TIMEOUT_MS = int(os.getenv('MEASUREMENTS_WRITE_BEHIND_ENQUEUE_TIMEOUT_MS', '100'))
+# Read-through cache of list, aggregate, heatmap and cluster responses: a per-process LRU of MAX_ENTRIES
+# responses in front of the MEASUREMENTS_CACHE_ALIAS backend of CACHES, shared by every process. Writes through
+# the API invalidate list and aggregate responses; heatmap tiles, clusters and writes outside the API (admin,
+# partition maintenance) show up after the timeouts.
+MEASUREMENTS_CACHE_ENABLED = os.getenv('MEASUREMENTS_CACHE_ENABLED', 'True').lower() == 'true'
+MEASUREMENTS_CACHE_ALIAS = os.getenv('MEASUREMENTS_CACHE_ALIAS', 'default')
+MEASUREMENTS_CACHE_MAX_ENTRIES = int(os.getenv('MEASUREMENTS_CACHE_MAX_ENTRIES', '1000'))
+MEASUREMENTS_CACHE_SECONDS = int(os.getenv('MEASUREMENTS_CACHE_SECONDS', '60'))
+# How long a heatmap tile stays in the cache
+MEASUREMENTS_HEATMAP_CACHE_SECONDS = int(os.getenv('MEASUREMENTS_HEATMAP_CACHE_SECONDS', '300'))
+
+
+# Compression
+# Request bodies sent with Content-Encoding gzip/zstd are decompressed on these path prefixes only.
+DECOMPRESSED_REQUEST_PATHS = (
+    '/measurements/bulk_create/',
+    '/measurements/ingest/',
+    '/measurements/jobs/',
+)
+# Upper bound on the decompressed size of a request body, guards against decompression bombs.
+DECOMPRESSED_REQUEST_MAX_SIZE = int(os.getenv('DECOMPRESSED_REQUEST_MAX_SIZE', str(512 * 1024 * 1024)))
+# Responses smaller than this are sent uncompressed.
+COMPRESSED_RESPONSE_MIN_SIZE = int(os.getenv('COMPRESSED_RESPONSE_MIN_SIZE', '1024'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
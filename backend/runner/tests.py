@@ -0,0 +1,50 @@
+import threading
+from unittest import mock
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.measurements import interfaces
+from runner.bootstrap import get_bootstrapper
+
+
+@override_settings(MEASUREMENTS_WRITE_BEHIND_ENABLED=True, MEASUREMENTS_CACHE_ENABLED=True)
+class BootstrapperTests(SimpleTestCase):
+    def tearDown(self):
+        get_bootstrapper().get_measurements_service()._write_behind_buffer.close()
+        # leave a bootstrapper built from the default settings to the other tests
+        with self.settings(MEASUREMENTS_WRITE_BEHIND_ENABLED=False):
+            get_bootstrapper(force_recreate=True)
+
+    def test_builds_the_service_once_per_process(self):
+        service = get_bootstrapper(force_recreate=True).get_measurements_service()
+        thread_count = threading.active_count()
+
+        again = get_bootstrapper().get_measurements_service()
+        get_bootstrapper()
+
+        self.assertIs(again, service)
+        self.assertIs(again._write_behind_buffer, service._write_behind_buffer)
+        self.assertIs(again._cache, service._cache)
+        self.assertEqual(threading.active_count(), thread_count)
+
+
+@override_settings(MEASUREMENTS_WRITE_BEHIND_ENABLED=False, MEASUREMENTS_CACHE_ENABLED=True)
+class BootstrapperCacheTests(TestCase):
+    def setUp(self):
+        get_bootstrapper(force_recreate=True)
+        caches[settings.MEASUREMENTS_CACHE_ALIAS].clear()
+
+    def test_second_identical_read_is_served_from_the_local_tier(self):
+        request = interfaces.MeasurementListReq(technology='LTE', limit=5)
+        get_bootstrapper().get_measurements_service().list_measurements(request)
+
+        shared = caches[settings.MEASUREMENTS_CACHE_ALIAS]
+        with mock.patch.object(shared, 'get', wraps=shared.get) as shared_get, \
+                CaptureQueriesContext(connection) as queries:
+            get_bootstrapper().get_measurements_service().list_measurements(request)
+
+        self.assertEqual(len(queries), 0)
+        # only the generation is read from the shared backend, the response itself comes from the process
+        self.assertFalse([call for call in shared_get.call_args_list if ':list:' in call.args[0]])
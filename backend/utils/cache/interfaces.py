@@ -0,0 +1,23 @@
+import abc
+from typing import Any, Callable, Iterable, Optional
+
+
+class AbstractCache(abc.ABC):
+    @abc.abstractmethod
+    def get_or_set(self, namespace: str, key: str, compute: Callable[[], Any], timeout: int,
+                   scopes: Optional[Iterable[str]] = None) -> Any:
+        """
+        Read-through lookup: return the value cached for key in the current generations of the given scopes of
+        namespace (of the whole namespace when scopes is None), or call compute(), cache its result for timeout
+        seconds and return it. With no scopes the value only expires. compute() should not return None.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def invalidate(self, namespace: str, scopes: Iterable[str] = ()) -> None:
+        """
+        Start a new generation of namespace and of the given scopes of it, so every value cached so far for
+        the whole namespace or for one of the scopes is never served again, by any process sharing the cache
+        backend.
+        """
+        raise NotImplementedError
@@ -0,0 +1,103 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, List, Optional
+from django.core.cache.backends.base import BaseCache
+from . import interfaces
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Bounded, thread safe in-process cache evicting the least recently used entry first"""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires at on the monotonic clock, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any, timeout: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class TieredCache(interfaces.AbstractCache):
+    """
+    A bounded in-process LRU in front of a Django cache backend shared by every process (Redis, Memcached,
+    ...). Keys embed the generations they depend on, kept in the shared backend, so invalidate() is an
+    increment per generation and old entries simply stop being looked up until they expire or are evicted.
+    Values cached without scopes depend on no generation and are served from the LRU without a shared read.
+    """
+
+    def __init__(self, shared: BaseCache, max_entries: int = 1000):
+        self._shared = shared
+        self._local = LRUCache(max_entries)
+
+    def get_or_set(self, namespace: str, key: str, compute: Callable[[], Any], timeout: int,
+                   scopes: Optional[Iterable[str]] = None) -> Any:
+        generation_keys = [self._generation_key(namespace)] if scopes is None else \
+            [self._generation_key(namespace, scope) for scope in sorted(set(scopes))]
+        versioned_key = f"{namespace}:{self._version(self._get_generations(generation_keys))}:{key}"
+        value = self._local.get(versioned_key)
+        if value is not None:
+            logger.debug(f"Cache hit for {versioned_key} in process")
+            return value
+
+        value = self._shared.get(versioned_key)
+        if value is None:
+            value = compute()
+            self._shared.set(versioned_key, value, timeout)
+        else:
+            logger.debug(f"Cache hit for {versioned_key} in shared backend")
+        self._local.set(versioned_key, value, timeout)
+        return value
+
+    def invalidate(self, namespace: str, scopes: Iterable[str] = ()) -> None:
+        generation_keys = [self._generation_key(namespace)] + \
+            [self._generation_key(namespace, scope) for scope in set(scopes)]
+        for generation_key in generation_keys:
+            try:
+                generation = self._shared.incr(generation_key)
+            except ValueError:
+                # no generation yet (or it was evicted); _get_generations starts a new one
+                generation = self._get_generations([generation_key])[0]
+            logger.debug(f"Cache generation {generation_key} is at {generation}")
+
+    def _get_generations(self, generation_keys: List[str]) -> List[int]:
+        if not generation_keys:
+            return []
+        generations = self._shared.get_many(generation_keys)
+        for generation_key in generation_keys:
+            if generation_key not in generations:
+                # start from the clock rather than 0, so a generation lost from the backend can't come back
+                # and serve the entries still cached under it
+                self._shared.add(generation_key, time.time_ns(), timeout=None)
+                generations[generation_key] = self._shared.get(generation_key)
+        return [generations[generation_key] for generation_key in generation_keys]
+
+    @staticmethod
+    def _version(generations: List[int]) -> str:
+        if len(generations) <= 1:
+            return ''.join(str(generation) for generation in generations)
+        # many scopes would make the key longer than some backends (Memcached) accept
+        return hashlib.sha1(':'.join(str(generation) for generation in generations).encode()).hexdigest()
+
+    @staticmethod
+    def _generation_key(namespace: str, scope: Optional[str] = None) -> str:
+        return f"{namespace}:generation" if scope is None else f"{namespace}:{scope}:generation"
@@ -6,15 +6,27 @@ import { DataGrid } from "@mui/x-data-grid";
 
 function App() {
   const [measurements, setMeasurements] = useState([]);
+  const [technologyGroups, setTechnologyGroups] = useState([]);
+  const [arfcnGroups, setArfcnGroups] = useState([]);
 
   useEffect(() => {
-    fetch("http://localhost:8000/measurements/")
+    fetch("http://localhost:8000/measurements/?count=none")
       .then((res) => res.json())
       .then((data) => {
         setMeasurements(data.results || []);
         console.log("Fetched data:", data);
       })
       .catch((err) => console.error("Error fetching measurements:", err));
+
+    // Chart counts are computed by the backend over all measurements, not just the listed page
+    fetch("http://localhost:8000/measurements/aggregate/?group_by=technology")
+      .then((res) => res.json())
+      .then((data) => setTechnologyGroups(data.groups || []))
+      .catch((err) => console.error("Error fetching technology counts:", err));
+    fetch("http://localhost:8000/measurements/aggregate/?group_by=arfcn&technology=LTE")
+      .then((res) => res.json())
+      .then((data) => setArfcnGroups(data.groups || []))
+      .catch((err) => console.error("Error fetching ARFCN counts:", err));
   }, []);
 
   return (
@@ -26,14 +38,14 @@ function App() {
       <div className="grid grid-cols-1 md:grid-cols-2 gap-6 p-6 w-full">
         <div className="bg-zinc-800 rounded-xl shadow-lg p-4 flex items-center justify-center w-full">
           <ChartSection
-            measurements={measurements}
+            groups={technologyGroups}
             type="technology"
             title="Technology Lifetime"
           />
         </div>
         <div className="bg-zinc-800 rounded-xl shadow-lg p-4 flex items-center justify-center w-full">
           <ChartSection
-            measurements={measurements}
+            groups={arfcnGroups}
             type="arfcn"
             title="ARFCN Lifetime for 4G"
           />
@@ -4,9 +4,9 @@ import { Chart as ChartJS, ArcElement, Tooltip, Legend, Title } from "chart.js";
 
 ChartJS.register(ArcElement, Tooltip, Legend, Title);
 
-function ChartSection({ measurements, type, title }) {
+function ChartSection({ groups, type, title }) {
   const data = useMemo(() => {
-    if (!measurements || measurements.length === 0) {
+    if (!groups || groups.length === 0) {
       return {
         labels: ["No Data"],
         datasets: [{ data: [0], backgroundColor: ["#888"] }],
@@ -16,7 +16,7 @@ function ChartSection({ measurements, type, title }) {
     if (type === "technology") {
       const techs = ["2G", "3G", "LTE", "5G", "6G"];
       const counts = techs.map(
-        (tech) => measurements.filter((m) => m.technology === tech).length
+        (tech) => groups.find((g) => g.technology === tech)?.count || 0
       );
       return {
         labels: techs,
@@ -37,14 +37,10 @@ function ChartSection({ measurements, type, title }) {
     }
 
     if (type === "arfcn") {
-      const arfcnCounts = {};
-      measurements
-        .filter((m) => m.technology === "LTE" && m.arfcn)
-        .forEach((m) => {
-          arfcnCounts[m.arfcn] = (arfcnCounts[m.arfcn] || 0) + 1;
-        });
-      const arfcns = Object.keys(arfcnCounts);
-      const counts = arfcns.map((arfcn) => arfcnCounts[arfcn]);
+      // groups come from /measurements/aggregate/?group_by=arfcn&technology=LTE
+      const arfcnGroups = groups.filter((g) => g.arfcn);
+      const arfcns = arfcnGroups.map((g) => String(g.arfcn));
+      const counts = arfcnGroups.map((g) => g.count);
       return {
         labels: arfcns.length > 0 ? arfcns : ["No Data"],
         datasets: [
@@ -72,7 +68,7 @@ function ChartSection({ measurements, type, title }) {
       labels: ["No Data"],
       datasets: [{ data: [0], backgroundColor: ["#888"] }],
     };
-  }, [measurements, type]);
+  }, [groups, type]);
 
   if (!data || !data.labels) {
     return <p>No chart data available</p>;
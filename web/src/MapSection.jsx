@@ -1,20 +1,120 @@
-import { MapContainer, TileLayer, CircleMarker } from "react-leaflet";
+import { MapContainer, TileLayer, CircleMarker, useMap, useMapEvents } from "react-leaflet";
+import L from "leaflet";
 import "leaflet/dist/leaflet.css";
-import React, { useState } from "react";
+import React, { useEffect, useState } from "react";
+
+const getColor = (rsrp) => {
+  if (rsrp > -95) return "green";
+  if (rsrp > -105) return "orange";
+  return "red";
+};
+
+// Coverage tiles binned by the backend; each bin is shaded by its mean rsrp
+const HeatmapGridLayer = L.GridLayer.extend({
+  createTile(coords, done) {
+    const tile = document.createElement("canvas");
+    const size = this.getTileSize();
+    tile.width = size.x;
+    tile.height = size.y;
+    fetch(`http://localhost:8000/measurements/heatmap/${coords.z}/${coords.x}/${coords.y}/`)
+      .then((res) => res.json())
+      .then((data) => {
+        const context = tile.getContext("2d");
+        const binWidth = size.x / data.bins;
+        const binHeight = size.y / data.bins;
+        (data.cells || []).forEach((cell) => {
+          if (cell.rsrp_avg === null) return;
+          context.globalAlpha = Math.min(0.3 + Math.log10(cell.count) / 3, 0.8);
+          context.fillStyle = getColor(cell.rsrp_avg);
+          context.fillRect(cell.x * binWidth, cell.y * binHeight, binWidth, binHeight);
+        });
+        done(null, tile);
+      })
+      .catch((err) => done(err, tile));
+    return tile;
+  },
+});
+
+function HeatmapLayer() {
+  const map = useMap();
+
+  useEffect(() => {
+    const layer = new HeatmapGridLayer({ opacity: 0.7 });
+    layer.addTo(map);
+    return () => layer.remove();
+  }, [map]);
+
+  return null;
+}
+
+// Loads the measurement clusters of the visible map area whenever the map is panned or zoomed
+function ViewportLoader({ onLoad }) {
+  const map = useMapEvents({
+    moveend: () => loadViewport(map, onLoad),
+  });
+
+  useEffect(() => {
+    loadViewport(map, onLoad);
+  }, [map, onLoad]);
+
+  return null;
+}
+
+function loadViewport(map, onLoad) {
+  const bounds = map.getBounds();
+  const bbox = [
+    Math.max(bounds.getWest(), -180),
+    Math.max(bounds.getSouth(), -90),
+    Math.min(bounds.getEast(), 180),
+    Math.min(bounds.getNorth(), 90),
+  ]
+    .map((value) => value.toFixed(6))
+    .join(",");
+  fetch(`http://localhost:8000/measurements/clusters/?bbox=${bbox}&zoom=${map.getZoom()}`)
+    .then((res) => res.json())
+    .then((data) => onLoad(data.clusters || []))
+    .catch((err) => console.error("Error fetching map clusters:", err));
+}
+
+// Single measurements open in the info panel, clusters zoom the map in on their centroid
+function ClusterMarkers({ clusters, onSelect }) {
+  const map = useMap();
+
+  const handleClick = (cluster) => {
+    if (cluster.count === 1 && cluster.id) {
+      fetch(`http://localhost:8000/measurements/${cluster.id}/`)
+        .then((res) => res.json())
+        .then(onSelect)
+        .catch((err) => console.error("Error fetching measurement:", err));
+    } else {
+      map.setView([cluster.latitude, cluster.longitude], map.getZoom() + 2);
+    }
+  };
+
+  return clusters.map((cluster) => (
+    <CircleMarker
+      key={`${cluster.latitude},${cluster.longitude},${cluster.count}`}
+      center={[cluster.latitude, cluster.longitude]}
+      radius={cluster.count === 1 ? 10 : Math.min(10 + Math.log2(cluster.count) * 3, 30)}
+      pathOptions={{ color: getColor(cluster.rsrp_avg) }}
+      eventHandlers={{
+        click: () => handleClick(cluster),
+      }}
+    />
+  ));
+}
 
 function MapSection({ points }) {
   const [selectedPoint, setSelectedPoint] = useState(null);
+  const [clusters, setClusters] = useState(null);
+  // until the first viewport is loaded, show the listed measurements as single point clusters
+  const shownClusters =
+    clusters ?? points.map((point) => ({ ...point, count: 1, rsrp_avg: point.rsrp }));
 
   const handleMapCreated = (map) => {
     map.scrollWheelZoom.disable();
   };
 
-  const getColor = (rsrp) => {
-    if (rsrp > -95) return "green";
-    if (rsrp > -105) return "orange";
-    return "red";
-  };
-
   return (
     <div className="flex flex-col w-full">
       <h2 className="text-white text-lg font-semibold mb-4">
@@ -37,17 +137,9 @@ function MapSection({ points }) {
                 url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
                 attribution="&copy; OpenStreetMap contributors"
               />
-              {points.map((point) => (
-                <CircleMarker
-                  key={point.id}
-                  center={[point.latitude, point.longitude]}
-                  radius={10}
-                  pathOptions={{ color: getColor(point.rsrp) }}
-                  eventHandlers={{
-                    click: () => setSelectedPoint(point),
-                  }}
-                />
-              ))}
+              <HeatmapLayer />
+              <ViewportLoader onLoad={setClusters} />
+              <ClusterMarkers clusters={shownClusters} onSelect={setSelectedPoint} />
             </MapContainer>
           </div>
         </div>